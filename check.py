@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 import argparse
+import contextlib
 import csv
+import functools
+import hashlib
+import io
+import json
 import os
 import sys
 import yaml
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from glob import glob
+from itertools import repeat
 import re
 
 from sty import bg, ef, fg, rs
@@ -13,8 +21,285 @@ from tabulate import tabulate
 import cppcheckdata
 from misra import getArguments, isFunctionCall
 
+__version__ = "0.1.0"
+
+RULES_YML_DEFAULT = os.path.join(os.path.dirname(__file__), "rules.yml")
+
+
+class FamilyMatcher:
+    """
+    Match a name against several pattern families with a single regex scan.
+    Substring families match anywhere in the name, exact families only the
+    whole name. Results are cached per name.
+    """
+
+    def __init__(self, substring_families, exact_families):
+        parts = []
+        for family, values in substring_families.items():
+            if values:
+                alternation = "|".join(re.escape(v) for v in values)
+                parts.append(f"(?=.*?(?P<{family}>{alternation}))?")
+        for family, values in exact_families.items():
+            if values:
+                alternation = "|".join(re.escape(v) for v in values)
+                parts.append(f"(?=(?P<{family}>{alternation})\\Z)?")
+        self.regex = re.compile("".join(parts), re.DOTALL)
+        self.cache = {}
+
+    def match(self, name):
+        """
+        Set of family names matching name
+        """
+        families = self.cache.get(name)
+        if families is None:
+            groups = self.regex.match(name).groupdict()
+            families = frozenset(k for k, v in groups.items() if v is not None)
+            self.cache[name] = families
+        return families
+
+
+class RuleConfig(Mapping):
+    """
+    Immutable rules.yml contents with precompiled name matchers
+    """
+
+    # lists of substrings searched for in function or type names
+    PATTERN_KEYS = (
+        "IRQ_NAMES",
+        "RULE_1_1_EXCEPTIONS",
+    )
+
+    # lists of substrings searched for in calls made from ISR/tasks
+    ISR_PATTERN_KEYS = (
+        "DELAY_FUNCTIONS",
+        "OLED_FUNCTIONS",
+        "PRINTF_FUNCTIONS",
+    )
+
+    # exact names of RTOS calls that have a FromISR variant
+    ISR_NAME_KEYS = ("RTOS_NON_ISR_FUNCTIONS",)
+
+    DEFAULTS = {
+        "RTOS_NON_ISR_FUNCTIONS": ["xQueueSend", "xSemaphoreGive"],
+    }
+
+    # lists of exact names
+    NAME_KEYS = (
+        "RULE_1_3_EXCEPTIONS",
+        "RULE_1_3_FUNC_EXCEPTIONS",
+        "RULE_4_3_EXCEPTIONS",
+    )
+
+    REQUIRED_KEYS = PATTERN_KEYS + ISR_PATTERN_KEYS + (
+        "RULE_1_3_EXCEPTIONS",
+        "RULE_1_1_ERRO_TXT",
+        "RULE_1_2_ERRO_TXT",
+        "RULE_1_3_ERRO_TXT",
+        "RULE_2_1_ERRO_TXT",
+        "RULE_2_2_ERRO_TXT",
+        "RULE_3_1_ERRO_TXT",
+        "RULE_3_2_ERRO_TXT",
+        "RULE_3_3_ERRO_TXT",
+        "RULE_3_4_ERRO_TXT",
+        "RULE_4_1_ERRO_TXT",
+        "RULE_4_2_ERRO_TXT",
+        "RULE_4_3_ERRO_TXT",
+        "RULE_4_4_ERRO_TXT",
+    )
+
+    def __init__(self, config, path=None):
+        missing = [k for k in self.REQUIRED_KEYS if k not in config]
+        if missing:
+            raise ValueError(f"{path}: missing keys {', '.join(missing)}")
+        for key, value in config.items():
+            if not isinstance(value, list) or not all(
+                isinstance(v, str) for v in value
+            ):
+                raise ValueError(f"{path}: {key} must be a list of strings")
+
+        config = {**self.DEFAULTS, **config}
+        self._config = {k: tuple(v) for k, v in config.items()}
+        self._patterns = {}
+        for key in self.PATTERN_KEYS:
+            values = self._config.get(key, ())
+            # an empty alternation would match everything
+            pattern = "|".join(re.escape(v) for v in values) if values else "(?!)"
+            self._patterns[key] = re.compile(pattern)
+        self._names = {}
+        for key in self.NAME_KEYS:
+            self._names[key] = frozenset(self._config.get(key, ()))
+        self._isr_matcher = FamilyMatcher(
+            {key: self._config[key] for key in self.ISR_PATTERN_KEYS},
+            {key: self._config[key] for key in self.ISR_NAME_KEYS},
+        )
+
+    def __getitem__(self, key):
+        return self._config[key]
+
+    def __iter__(self):
+        return iter(self._config)
+
+    def __len__(self):
+        return len(self._config)
+
+    def search(self, key, name):
+        """
+        True if any substring listed under key occurs in name
+        """
+        return self._patterns[key].search(name) is not None
+
+    def names(self, key):
+        return self._names[key]
+
+    def isr_families(self, name):
+        """
+        Keys of the ISR_PATTERN_KEYS / ISR_NAME_KEYS lists matching name
+        """
+        return self._isr_matcher.match(name)
+
+
+@functools.lru_cache(maxsize=None)
+def load_rules_config(rules_yml):
+    """
+    Parse and validate a rules.yml file, once per process
+    """
+    config = {}
+    with open(rules_yml, "r") as stream:
+        try:
+            config = yaml.safe_load(stream)
+        except yaml.YAMLError as exc:
+            print(exc)
+    return RuleConfig(config or {}, rules_yml)
+
+
+@functools.lru_cache(maxsize=None)
+def read_rules_yml_bytes(rules_yml):
+    with open(rules_yml, "rb") as stream:
+        return stream.read()
+
+
+def print_log_xml(erro_log):
+    xml_header = '<?xml version="1.0" encoding="UTF-8"?>\n<results version="2">\n    <code-quality version="1"/>\n    <errors>'
+    xml_footer = "    </errors>\n</results>"
+
+    xml_errors = ""
+    for error in erro_log:
+        xml_error = f"""
+        <error id="{error['alias']}" severity="style" msg="{error['text']}">
+            <location file="{error['file']}"/>
+        </error>"""
+        xml_errors += xml_error
+
+    xml_full = f"{xml_header}{xml_errors}\n{xml_footer}"
+    print(xml_full, file=sys.stderr)
+
+
+class RuleEngine:
+    """
+    Single traversal of a configuration. Every token is dispatched to the
+    visitors registered for its kinds:
+
+        token       every token
+        name        name tokens (identifiers and keywords)
+        loop        while / for / do keywords
+        op          operator tokens
+        assignment  assignment operators
+        call        "(" of a function call
+        directive   preprocessor directives
+    """
+
+    KINDS = ("token", "name", "loop", "op", "assignment", "call", "directive")
+
+    LOOP_KEYWORDS = frozenset(("while", "for", "do"))
+
+    def __init__(self):
+        self.visitors = {kind: [] for kind in self.KINDS}
+
+    def register(self, kind, visitor):
+        # several rules can ask for the same visitor, run it only once
+        if visitor not in self.visitors[kind]:
+            self.visitors[kind].append(visitor)
+
+    def run(self, cfg):
+        token_visitors = self.visitors["token"]
+        name_visitors = self.visitors["name"]
+        loop_visitors = self.visitors["loop"]
+        op_visitors = self.visitors["op"]
+        assignment_visitors = self.visitors["assignment"]
+        call_visitors = self.visitors["call"]
+
+        for token in cfg.tokenlist:
+            for visit in token_visitors:
+                visit(token)
+            if token.isName:
+                for visit in name_visitors:
+                    visit(token)
+                if token.str in self.LOOP_KEYWORDS:
+                    for visit in loop_visitors:
+                        visit(token)
+            elif token.isOp:
+                for visit in op_visitors:
+                    visit(token)
+                if token.isAssignmentOp:
+                    for visit in assignment_visitors:
+                        visit(token)
+            # "(" is an extended op in cppcheck dumps, isOp is False for it
+            if call_visitors and token.str == "(" and isFunctionCall(token):
+                for visit in call_visitors:
+                    visit(token)
+
+        for directive in cfg.directives:
+            for visit in self.visitors["directive"]:
+                visit(directive)
+
+
+class CallGraph:
+    """
+    Function call graph of one configuration, built from token.function links
+    """
+
+    def __init__(self, calls):
+        # Function Id -> list of called Function, in call order
+        self.calls = calls
+        self.reachable_cache = {}
+
+    def reachable(self, function):
+        """
+        Functions reachable from function (itself first), cached per root
+        """
+        if function.Id in self.reachable_cache:
+            return self.reachable_cache[function.Id]
+
+        reachable = []
+        visited = set()
+        stack = [function]
+        while stack:
+            f = stack.pop()
+            if f.Id in visited:
+                continue
+            visited.add(f.Id)
+            reachable.append(f)
+            stack.extend(reversed(self.calls.get(f.Id, [])))
+
+        self.reachable_cache[function.Id] = reachable
+        return reachable
+
 
 class checker:
+    # token kinds each rule needs to see during the RuleEngine traversal,
+    # on top of the visitors that build the per configuration context
+    RULE_VISITORS = {
+        "rule_2_1": (("directive", "visit_header_directive"),),
+        "rule_2_2": (("op", "visit_header_op"),),
+        "rule_3_1": (("name", "visit_isr_call"),),
+        "rule_3_2": (("name", "visit_isr_call"),),
+        "rule_3_3": (("name", "visit_isr_call"),),
+        "rule_3_4": (("loop", "visit_loop"),),
+        "rule_4_1": (("name", "visit_isr_call"),),
+        "rule_4_2": (("name", "visit_from_isr"),),
+        "rule_4_3": (("name", "visit_isr_call"),),
+    }
+
     def __init__(
         self, data, repo_name, file_path, rtos, rules_yml=None, print_enable=True
     ):
@@ -29,18 +314,69 @@ class checker:
         self.print_enable = print_enable
         self.erro_log = []
         self.cfg = []
-
-    def update_cfg(self, cfg):
+        self.reset_context()
+
+    def reset_context(self):
+        self.token_scope = {}
+        self.scope_function = {}
+        self.calls = {}
+        self.irq_callbacks = []
+        self.isr_calls = {}
+        self.from_isr_calls = {}
+        self.loops = {}
+        self.header_ops = []
+        self.header_files = []
+        self.header_directives = {}
+        self.call_graph = CallGraph({})
+        self.irq_funcs = []
+        self.irq_func_names = set()
+        self.task_funcs = []
+        self.task_func_names = set()
+        self.var_ass = []
+        self.var_ass_by_var = {}
+        self.var_ass_by_function = {}
+        self.global_var_ass = []
+
+    def update_cfg(self, cfg, rules=None):
+        """
+        Build the per configuration analysis context, shared by all rules,
+        in one RuleEngine traversal. rules lists the rules that will run
+        (default: all), only their visitors are registered.
+        """
         self.cfg = cfg
+        self.reset_context()
+
+        engine = RuleEngine()
+        engine.register("token", self.visit_token)
+        engine.register("call", self.visit_irq_callback)
+        engine.register("assignment", self.visit_assignment)
+        if rules is None:
+            rules = self.RULE_VISITORS
+        for rule in rules:
+            for kind, visitor in self.RULE_VISITORS.get(rule, ()):
+                engine.register(kind, getattr(self, visitor))
+        engine.run(cfg)
+
+        self.call_graph = CallGraph(
+            {f_id: list(callees.values()) for f_id, callees in self.calls.items()}
+        )
+        self.irq_funcs = self.create_function_irq_list()
+        self.irq_func_names = {func.name for func in self.irq_funcs}
+        self.task_funcs = self.create_rtos_task_list()
+        self.task_func_names = {func.name for func in self.task_funcs}
+        self.var_ass_by_var, self.var_ass_by_function = self.index_var_ass()
+        self.global_var_ass = self.get_only_golbal_var_ass()
+
+    def release_cfg(self):
+        """
+        Drop the configuration and its analysis context once the rules ran
+        """
+        self.cfg = []
+        self.reset_context()
 
     def read_config(self):
-        rules_yml_default = os.path.join(os.path.dirname(__file__), "rules.yml")
-        rules_yml = rules_yml_default if self.rules_yml == None else self.rules_yml
-        with open(rules_yml, "r") as stream:
-            try:
-                self.config = yaml.safe_load(stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        rules_yml = RULES_YML_DEFAULT if self.rules_yml == None else self.rules_yml
+        self.config = load_rules_config(rules_yml)
 
     def get_vars(self):
         return self.cfg.variables
@@ -51,13 +387,25 @@ class checker:
     def is_header(self, file):
         return file.lower().endswith(".h")
 
-    def get_previous_scope(self, scope_id):
-        cnt = 0
-        scopes = self.get_scopes()
-        for scope in scopes:
-            if scope.Id == scope_id:
-                return scopes[cnt - 1]
-            cnt = cnt + 1
+    def get_function_scope(self, scope):
+        while scope is not None and scope.type != "Function":
+            scope = scope.nestedIn
+        return scope
+
+    def visit_token(self, token):
+        """
+        Map token Id to its enclosing Function scope (None outside functions)
+        and record call graph edges from token.function links
+        """
+        scope = token.scope
+        if scope.Id not in self.scope_function:
+            self.scope_function[scope.Id] = self.get_function_scope(scope)
+        function_scope = self.scope_function[scope.Id]
+        self.token_scope[token.Id] = function_scope
+
+        if token.function is not None and function_scope is not None:
+            callees = self.calls.setdefault(function_scope.function.Id, {})
+            callees.setdefault(token.function.Id, token.function)
 
     def get_only_global_vars(self):
         vars = []
@@ -67,10 +415,7 @@ class checker:
         return vars
 
     def get_scope(self, token):
-        scope = token.scope
-        while scope.type != "Function":
-            scope = self.get_previous_scope(scope.Id)
-        return scope
+        return self.token_scope.get(token.Id)
 
     def get_var_ass(self, token):
         var = None
@@ -86,40 +431,91 @@ class checker:
             var = token.astOperand1.variable
         return var
 
-    def get_all_var_ass(self):
-        ass = []
-
-        for token in self.cfg.tokenlist:
-            if token.isAssignmentOp and token.scope.type != "Global":
-                variable = self.get_var_ass(token)
-                if variable is None:
-                    continue
-
-                scope = self.get_scope(token)
-                ass.append(
-                    {
-                        "className": scope.className,
-                        "variable": variable,
-                        "line": token.linenr,
-                    }
-                )
-        return ass
+    def visit_assignment(self, token):
+        if token.scope.type == "Global":
+            return
 
-    def get_only_golbal_var_ass(self):
-        all_var_ass = self.get_all_var_ass()
-        global_vars = self.get_only_global_vars()
+        variable = self.get_var_ass(token)
+        if variable is None:
+            return
+
+        scope = self.get_scope(token)
+        if scope is None:
+            return
+
+        self.var_ass.append(
+            {
+                "className": scope.className,
+                "variable": variable,
+                "line": token.linenr,
+            }
+        )
 
+    def visit_isr_call(self, token):
+        # calls forbidden in ISR (delay, oled, printf, rtos) by function
+        if not self.config.isr_families(token.str):
+            return
+        scope = self.get_scope(token)
+        if scope is not None:
+            self.isr_calls.setdefault(scope.function.Id, []).append(token)
+
+    def visit_from_isr(self, token):
+        if token.str.find("FromISR") < 0:
+            return
+        scope = self.get_scope(token)
+        if scope is not None:
+            self.from_isr_calls.setdefault(scope.function.Id, []).append(token)
+
+    def visit_loop(self, token):
+        scope = self.get_scope(token)
+        if scope is not None:
+            self.loops.setdefault(scope.function.Id, []).append(token)
+
+    def visit_header_op(self, token):
+        if self.is_header(token.file):
+            self.header_ops.append(token)
+
+    def visit_header_directive(self, directive):
+        file_name = os.path.basename(directive.file)
+        if self.is_header(file_name) and file_name not in self.header_files:
+            self.header_files.append(file_name)
+        key = os.path.basename(directive.file.lower())
+        self.header_directives.setdefault(key, []).append(directive)
+
+    def index_var_ass(self):
+        """
+        Group var assigments by variable Id and by function name
+        """
+        by_var = {}
+        by_function = {}
+        for ass in self.var_ass:
+            by_var.setdefault(ass["variable"].Id, []).append(ass)
+            by_function.setdefault(ass["className"], []).append(ass)
+        return by_var, by_function
+
+    def get_only_golbal_var_ass(self):
         # create list of global var assigments
         global_ass = []
-        for var in global_vars:
-            for ass in all_var_ass:
-                if var.Id == ass["variable"].Id:
-                    global_ass.append(ass)
+        for var in self.get_only_global_vars():
+            global_ass.extend(self.var_ass_by_var.get(var.Id, []))
         return global_ass
 
     def is_funq_irq(self, f):
-        res = [ele for ele in self.config["IRQ_NAMES"] if (ele in f.name)]
-        return True if res else False
+        return self.config.search("IRQ_NAMES", f.name)
+
+    def visit_irq_callback(self, token):
+        # TODO: export this to config file
+        if token.previous.str == "gpio_set_irq_enabled_with_callback":
+            func_arg = getArguments(token)[-1]
+            if func_arg.str == "&":
+                # using function pointer a.k &btn_callback
+                func = func_arg.next
+            else:
+                # using only btn_callback
+                func = func_arg
+
+            if func.function is not None:
+                self.irq_callbacks.append(func.function)
 
     def create_function_irq_list(self):
         irq_funcs = []
@@ -128,23 +524,14 @@ class checker:
                 if f != None:
                     irq_funcs.append(f)
 
-        # TODO: export this to config file
-        for token in self.cfg.tokenlist:
-            if isFunctionCall(token):
-                if token.previous.str == "gpio_set_irq_enabled_with_callback":
-                    func_arg = getArguments(token)[-1]
-                    if func_arg.str == "&":
-                        # using function pointer a.k &btn_callback
-                        func = func_arg.next
-                    else:
-                        # using only btn_callback
-                        func = func_arg
-
-                    if func.function is not None:
-                        irq_funcs.append(func.function)
+        irq_funcs.extend(self.irq_callbacks)
 
         res = []
-        [res.append(x) for x in irq_funcs if x not in res]
+        res_ids = set()
+        for x in irq_funcs:
+            if x.Id not in res_ids:
+                res_ids.add(x.Id)
+                res.append(x)
         return res
 
     def create_rtos_task_list(self):
@@ -173,19 +560,7 @@ class checker:
             print(f" - [RULE {ruleN} {alias} VIOLATION] {where} \r\n\t {erro_text}")
 
     def print_log_xml(self):
-        xml_header = '<?xml version="1.0" encoding="UTF-8"?>\n<results version="2">\n    <code-quality version="1"/>\n    <errors>'
-        xml_footer = "    </errors>\n</results>"
-
-        xml_errors = ""
-        for error in self.erro_log:
-            xml_error = f"""
-        <error id="{error['alias']}" severity="style" msg="{error['text']}">
-            <location file="{error['file']}"/>
-        </error>"""
-            xml_errors += xml_error
-
-        xml_full = f"{xml_header}{xml_errors}\n{xml_footer}"
-        print(xml_full, file=sys.stderr)
+        print_log_xml(self.erro_log)
 
     def rule_1_1(self):
         """
@@ -193,23 +568,17 @@ class checker:
         """
         erro = 0
 
-        assigments = self.get_only_golbal_var_ass()
-        irq_funcs = self.create_function_irq_list()
+        assigments = self.global_var_ass
 
-        # create lisr of function IRQ name
-        irq_func_class_names = []
-        for func in irq_funcs:
-            irq_func_class_names.append(func.name)
-
-        var_erro_list_id = []
+        var_erro_list_id = set()
         for ass in assigments:
             # excluce specific types exceptions (rtos, lcd)
             var_type = ass["variable"].typeStartToken.str
-            if [ele for ele in self.config["RULE_1_1_EXCEPTIONS"] if (ele in var_type)]:
+            if self.config.search("RULE_1_1_EXCEPTIONS", var_type):
                 continue
 
             # only check for var ass in IRQ functions
-            if ass["className"] not in irq_func_class_names:
+            if ass["className"] not in self.irq_func_names:
                 continue
 
             # skip duplicate error
@@ -225,7 +594,7 @@ class checker:
                     f"variable {var_name} in function {func_name}",
                     self.config["RULE_1_1_ERRO_TXT"],
                 )
-                var_erro_list_id.append(ass["variable"].Id)
+                var_erro_list_id.add(ass["variable"].Id)
                 erro = erro + 1
         return erro
 
@@ -236,17 +605,11 @@ class checker:
 
         erro = 0
 
-        assigments = self.get_all_var_ass()
-        irq_funcs = self.create_function_irq_list()
-
-        # create lisr of function IRQ name
-        irq_func_class_names = []
-        for func in irq_funcs:
-            irq_func_class_names.append(func.name)
+        assigments = self.var_ass
 
         for ass in assigments:
             # exclue IRQ functions
-            if ass["className"] in irq_func_class_names:
+            if ass["className"] in self.irq_func_names:
                 continue
 
             if ass["variable"].isVolatile and ass["variable"].isLocal:
@@ -267,29 +630,27 @@ class checker:
         """
         erro = 0
 
-        assigments = self.get_only_golbal_var_ass()
-        irq_funcs = self.create_function_irq_list()
+        assigments = self.global_var_ass
 
-        # create lisr of function IRQ name
-        irq_func_class_names = []
-        for func in irq_funcs:
-            irq_func_class_names.append(func.name)
-
-        # create var list that are update in ISR
-        var_ass_irq_ids = []
-        for ass in assigments:
-            if [ele for ele in irq_func_class_names if (ele in ass["className"])]:
-                var_ass_irq_ids.append(ass["variable"].Id)
+        # create var list that are update in ISR, an assignment counts as
+        # made in an ISR when its function name contains an IRQ function name
+        var_ass_irq_ids = set()
+        if self.irq_func_names:
+            irq_name = re.compile("|".join(re.escape(n) for n in self.irq_func_names))
+            for class_name, class_ass in self.var_ass_by_function.items():
+                if irq_name.search(class_name):
+                    for ass in class_ass:
+                        var_ass_irq_ids.add(ass["variable"].Id)
 
         # interact in global vars only assigments
-        var_erro_list_id = []
+        var_erro_list_id = set()
         for ass in assigments:
             # excluce specific types exceptions (rtos, lcd)
-            if ass["variable"].typeStartToken.str in self.config["RULE_1_3_EXCEPTIONS"]:
+            if ass["variable"].typeStartToken.str in self.config.names("RULE_1_3_EXCEPTIONS"):
                 continue
 
             # exclude assignments made from explicitly allowed functions (e.g. main)
-            if ass["className"] in self.config.get("RULE_1_3_FUNC_EXCEPTIONS", []):
+            if ass["className"] in self.config.names("RULE_1_3_FUNC_EXCEPTIONS"):
                 continue
 
             # exclude var that are accessed in Isr
@@ -308,7 +669,7 @@ class checker:
                 f"global variable {var_name}",
                 self.config["RULE_1_3_ERRO_TXT"],
             )
-            var_erro_list_id.append(ass["variable"].Id)
+            var_erro_list_id.add(ass["variable"].Id)
             erro = erro + 1
 
         return erro
@@ -318,21 +679,14 @@ class checker:
         Rule 3: search for forbiten functions call inside ISR
         """
         erro = 0
-        irq_funcs = self.create_function_irq_list()
-        for function in irq_funcs:
+        for function in self.irq_funcs:
+            # ISR body and every function it (transitively) calls
             tokens = []
-            for token in self.cfg.tokenlist:
-                scope = self.get_scope(token)
-                if scope.function.Id == function.Id:
-                    tokens.append(token)
-
-                    if token.functionId is not None:
-                        extra_tokens = self.get_tokens_function_call(token.functionId)
-                        tokens.extend(extra_tokens)
+            for called in self.call_graph.reachable(function):
+                tokens.extend(self.isr_calls.get(called.Id, []))
 
             for token in tokens:
-                res = [ele for ele in rule if (ele in token.str)]
-                if res:
+                if rule in self.config.isr_families(token.str):
                     irq_name = function.token.str
                     call_name = token.str
                     self.print_rule_violation(
@@ -352,7 +706,7 @@ class checker:
             "3_1",
             "delayInIRQ",
             self.config["RULE_3_1_ERRO_TXT"],
-            self.config["DELAY_FUNCTIONS"],
+            "DELAY_FUNCTIONS",
         )
 
     def rule_3_2(self):
@@ -363,7 +717,7 @@ class checker:
             "3_2",
             "oledInIRQ",
             self.config["RULE_3_2_ERRO_TXT"],
-            self.config["OLED_FUNCTIONS"],
+            "OLED_FUNCTIONS",
         )
 
     def rule_3_3(self):
@@ -374,7 +728,7 @@ class checker:
             "3_3",
             "printfInIRQ",
             self.config["RULE_3_3_ERRO_TXT"],
-            self.config["PRINTF_FUNCTIONS"],
+            "PRINTF_FUNCTIONS",
         )
 
     def rule_3_4(self):
@@ -383,20 +737,16 @@ class checker:
         """
         erro = 0
 
-        irq_funcs = self.create_function_irq_list()
-        for function in irq_funcs:
-            for token in self.cfg.tokenlist:
-                scope = self.get_scope(token)
-                if scope.function.Id == function.Id:
-                    if token.str in ["while", "for", "do"]:
-                        irq_name = function.token.str
-                        self.print_rule_violation(
-                            "3_4",
-                            "whileInIRQ",
-                            f"Use of {token.str} inside {irq_name}",
-                            self.config["RULE_3_4_ERRO_TXT"],
-                        )
-                        erro = erro + 1
+        for function in self.irq_funcs:
+            for token in self.loops.get(function.Id, []):
+                irq_name = function.token.str
+                self.print_rule_violation(
+                    "3_4",
+                    "whileInIRQ",
+                    f"Use of {token.str} inside {irq_name}",
+                    self.config["RULE_3_4_ERRO_TXT"],
+                )
+                erro = erro + 1
         return erro
 
     def rule_4_1(self):
@@ -404,21 +754,18 @@ class checker:
         Use fromISR in interruptions
         """
         erro = 0
-        irq_funcs = self.create_function_irq_list()
-        for function in irq_funcs:
-            for token in self.cfg.tokenlist:
-                scope = self.get_scope(token)
-                if scope.function.Id == function.Id:
-                    if token.str in ["xQueueSend", "xSemaphoreGive"]:
-                        if token.str.find("FromISR") < 0:
-                            irq_name = function.token.str
-                            self.print_rule_violation(
-                                "4_1",
-                                "rtosMissingFromISR",
-                                f"Use of {token.str} inside {irq_name}",
-                                self.config["RULE_4_1_ERRO_TXT"],
-                            )
-                            erro = erro + 1
+        for function in self.irq_funcs:
+            for token in self.isr_calls.get(function.Id, []):
+                if "RTOS_NON_ISR_FUNCTIONS" in self.config.isr_families(token.str):
+                    if token.str.find("FromISR") < 0:
+                        irq_name = function.token.str
+                        self.print_rule_violation(
+                            "4_1",
+                            "rtosMissingFromISR",
+                            f"Use of {token.str} inside {irq_name}",
+                            self.config["RULE_4_1_ERRO_TXT"],
+                        )
+                        erro = erro + 1
         return erro
 
     def rule_4_2(self):
@@ -426,49 +773,31 @@ class checker:
         Do not use fromISR in tasks
         """
         erro = 0
-        task_funcs = self.create_rtos_task_list()
-        for function in task_funcs:
-            for token in self.cfg.tokenlist:
-                scope = self.get_scope(token)
-                if scope.function.Id == function.Id:
-                    if token.str.find("FromISR") >= 0:
-                        irq_name = function.token.str
-                        self.print_rule_violation(
-                            "4_2",
-                            "rtosBadUseOfFromISR",
-                            f"Use of {token.str} inside {irq_name}",
-                            self.config["RULE_4_2_ERRO_TXT"],
-                        )
-                        erro = erro + 1
+        for function in self.task_funcs:
+            for token in self.from_isr_calls.get(function.Id, []):
+                irq_name = function.token.str
+                self.print_rule_violation(
+                    "4_2",
+                    "rtosBadUseOfFromISR",
+                    f"Use of {token.str} inside {irq_name}",
+                    self.config["RULE_4_2_ERRO_TXT"],
+                )
+                erro = erro + 1
         return erro
 
-    def get_tokens_function_call(self, functionId):
-        tokens = []
-        for token in self.cfg.tokenlist:
-            scope = self.get_scope(token)
-            if scope.function.Id == functionId:
-                tokens.append(token)
-        return tokens
-
     def rule_4_3(self):
         """
         Do not use time delay in tasks
         """
         erro = 0
-        task_funcs = self.create_rtos_task_list()
-        for function in task_funcs:
+        for function in self.task_funcs:
             tokens = []
-            for token in self.cfg.tokenlist:
-                scope = self.get_scope(token)
-                if scope.function.Id == function.Id:
-                    tokens.append(token)
-                    if token.functionId is not None:
-                        extra_tokens = self.get_tokens_function_call(token.functionId)
-                        tokens.extend(extra_tokens)
+            for called in self.call_graph.reachable(function):
+                tokens.extend(self.isr_calls.get(called.Id, []))
 
             for token in tokens:
-                if any(x in token.str for x in self.config["DELAY_FUNCTIONS"]):
-                    if any(token.str == exc for exc in self.config.get("RULE_4_3_EXCEPTIONS", [])):
+                if "DELAY_FUNCTIONS" in self.config.isr_families(token.str):
+                    if token.str in self.config.names("RULE_4_3_EXCEPTIONS"):
                         continue
                     task_name = function.token.str
                     self.print_rule_violation(
@@ -486,17 +815,17 @@ class checker:
         """
         erro = 0
 
-        var_erro_list = []
+        var_erro_list = set()
 
         # interact in global vars only assigments
-        for var in self.get_only_golbal_var_ass():
+        for var in self.global_var_ass:
             var_name = var["variable"].nameToken.str
             var_type = var["variable"].typeStartToken.str
 
             if var_name in var_erro_list:
                 continue
 
-            if var_type in self.config["RULE_1_3_EXCEPTIONS"]:
+            if var_type in self.config.names("RULE_1_3_EXCEPTIONS"):
                 continue
 
             self.print_rule_violation(
@@ -507,7 +836,7 @@ class checker:
             )
             erro = erro + 1
 
-            var_erro_list.append(var_name)
+            var_erro_list.add(var_name)
         return erro
 
     def canonical_form(self, s: str) -> str:
@@ -534,17 +863,8 @@ class checker:
         """
         erro = 0
 
-        h_list = []
-        for directives in self.cfg.directives:
-            file_name = os.path.basename(directives.file)
-            if self.is_header(file_name) and file_name not in h_list:
-                h_list.append(file_name)
-
-        for fname in h_list:
-            header_directives = []
-            for d in self.cfg.directives:
-                if os.path.basename(d.file.lower()) == fname.lower():
-                    header_directives.append(d)
+        for fname in self.header_files:
+            header_directives = self.header_directives.get(fname.lower(), [])
 
             # easy, no directives
             if len(header_directives) == 0 or len(header_directives) < 3:
@@ -577,34 +897,175 @@ class checker:
         """
         erro = 0
 
-        head_list = []
-        for token in self.cfg.tokenlist:
-            if self.is_header(token.file):
-                if token.isOp:
-                    if token.file in head_list:
-                        continue
+        head_list = set()
+        for token in self.header_ops:
+            if token.file in head_list:
+                continue
 
-                    # pointer declaration
-                    if token.astOperand1 is None:
-                        continue
+            # pointer declaration
+            if token.astOperand1 is None:
+                continue
 
-                    # skip prototype
-                    if token.astOperand1.variable is None:
-                        continue
+            # skip prototype
+            if token.astOperand1.variable is None:
+                continue
 
-                    file_name = os.path.basename(token.file)
+            file_name = os.path.basename(token.file)
 
-                    self.print_rule_violation(
-                        "2_2",
-                        "cInHeadFile",
-                        f"Use of C code declaration in line {token.linenr} inside file {file_name}",
-                        self.config["RULE_2_2_ERRO_TXT"],
-                    )
-                    head_list.append(token.file)
-                    erro = erro + 1
+            self.print_rule_violation(
+                "2_2",
+                "cInHeadFile",
+                f"Use of C code declaration in line {token.linenr} inside file {file_name}",
+                self.config["RULE_2_2_ERRO_TXT"],
+            )
+            head_list.add(token.file)
+            erro = erro + 1
         return erro
 
 
+# rules in report order
+RULES = (
+    "rule_1_1",
+    "rule_1_2",
+    "rule_1_3",
+    "rule_2_1",
+    "rule_2_2",
+    "rule_3_1",
+    "rule_3_2",
+    "rule_3_3",
+    "rule_3_4",
+    "rule_4_1",
+    "rule_4_2",
+    "rule_4_3",
+    "rule_4_4",
+)
+
+# dump sections read by the rules, the others are skipped while parsing
+DUMP_SECTIONS = ("tokenlist", "scopes", "variables", "directives")
+
+
+def is_default_cfg(name):
+    """
+    Configuration filter: only the default ("") configuration is checked
+    """
+    return name == ""
+
+
+def enabled_rules(rtos, disable):
+    rules = []
+    for rule in RULES:
+        if rule in disable:
+            continue
+        # global vars are only allowed in IRQ without rtos, never with it
+        if rule == "rule_1_3" and rtos:
+            continue
+        if rule == "rule_4_4" and not rtos:
+            continue
+        rules.append(rule)
+    return rules
+
+
+@functools.lru_cache(maxsize=None)
+def checker_sources_digest():
+    """
+    Hash of the checker sources (this file, cppcheckdata and misra), so any
+    change to the rule code invalidates the cached results
+    """
+    digest = hashlib.sha256()
+    for module in (sys.modules[__name__], cppcheckdata, sys.modules[isFunctionCall.__module__]):
+        with open(module.__file__, "rb") as stream:
+            digest.update(stream.read())
+    return digest.digest()
+
+
+def result_cache_key(f, rtos, disable):
+    """
+    Hash of the dump bytes, rules.yml, rule flags, tool version and sources
+    """
+    key = hashlib.sha256()
+    key.update(__version__.encode())
+    key.update(checker_sources_digest())
+    key.update(repr((rtos, sorted(disable))).encode())
+    key.update(read_rules_yml_bytes(RULES_YML_DEFAULT))
+    with open(f, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1 << 20), b""):
+            key.update(chunk)
+    return key.hexdigest()
+
+
+def read_result_cache(cache_dir, key):
+    try:
+        with open(os.path.join(cache_dir, key + ".json"), "r") as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+
+def write_result_cache(cache_dir, key, erro_log):
+    # repo name depends on the check path, not on the dump content
+    violations = [
+        {"rule": e["rule"], "alias": e["alias"], "file": e["file"], "text": e["text"]}
+        for e in erro_log
+    ]
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file = os.path.join(cache_dir, key + ".json")
+    with open(cache_file + f".{os.getpid()}.tmp", "w") as stream:
+        json.dump(violations, stream)
+    os.replace(cache_file + f".{os.getpid()}.tmp", cache_file)
+
+
+def check_file(f, check_path, rtos, disable, print_enable, cache_dir=None):
+    """
+    Run the enabled rules over one dump file, return (erro_total, erro_log)
+    """
+    print("--------------")
+    print(f)
+    check_name = os.path.relpath(f, check_path).split("/")[0]
+    print(f"Checking: {check_name}")
+
+    if cache_dir is not None:
+        key = result_cache_key(f, rtos, disable)
+        violations = read_result_cache(cache_dir, key)
+        if violations is not None:
+            # cache hit: replay the stored violations, no dump parsing
+            check = checker(None, check_name, f, rtos=rtos, print_enable=print_enable)
+            for v in violations:
+                check.print_rule_violation(v["rule"], v["alias"], v["file"], [v["text"]])
+            return check.erro_total, check.erro_log
+
+    # only the default configuration is checked, the others are not parsed
+    data = cppcheckdata.CppcheckData(
+        f, sections=DUMP_SECTIONS, cfg_filter=is_default_cfg
+    )
+    check = checker(data, check_name, f, rtos=rtos, print_enable=print_enable)
+    rules = enabled_rules(rtos, disable)
+    for cfg in data.iterconfigurations():
+        # one traversal collects what the enabled rules need
+        check.update_cfg(cfg, rules)
+        # the checker holds the only reference until release_cfg()
+        del cfg
+        for rule in rules:
+            getattr(check, rule)()
+        check.release_cfg()
+
+    if cache_dir is not None:
+        write_result_cache(cache_dir, key, check.erro_log)
+
+    return check.erro_total, check.erro_log
+
+
+def check_file_buffered(f, check_path, rtos, disable, print_enable, cache_dir=None):
+    """
+    check_file() for worker processes: stdout is captured and returned
+    with the result so the parent can print it in file order
+    """
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        erro_total, erro_log = check_file(
+            f, check_path, rtos, disable, print_enable, cache_dir
+        )
+    return out.getvalue(), erro_total, erro_log
+
+
 def main():
     parser = argparse.ArgumentParser(description="Process some dump c file")
     parser.add_argument(
@@ -633,6 +1094,18 @@ def main():
         type=str,
         help='disable rule by id: exemple --disable rule_1_1'
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of dump files checked in parallel",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="directory to cache results of unchanged dump files",
+    )
     args = parser.parse_args()
 
     file = args.check_path
@@ -650,49 +1123,29 @@ def main():
     erro_total = 0
     erro_log = []
 
-    for f in files:
-        print("--------------")
-        print(f)
-        check_name = os.path.relpath(f, file).split("/")[0]
-        print(f"Checking: {check_name}")
-        data = cppcheckdata.CppcheckData(f)
-        check = checker(data, check_name, f, rtos=args.rtos, print_enable=not args.xml)
-        for cfg in data.iterconfigurations():
-            if cfg.name != "":
-                continue
-            check.update_cfg(cfg)
-            check.get_only_global_vars()
-            check.get_all_var_ass()
-
-            if 'rule_1_1' not in disable:
-                check.rule_1_1()
-            if 'rule_1_2' not in disable:
-                check.rule_1_2()
-            if rtos is False and 'rule_1_3' not in disable:
-                check.rule_1_3()
-            if 'rule_2_1' not in disable:
-                check.rule_2_1()
-            if 'rule_2_2' not in disable:
-                check.rule_2_2()
-            if 'rule_3_1' not in disable:
-                check.rule_3_1()
-            if 'rule_3_2' not in disable:
-                check.rule_3_2()
-            if 'rule_3_3' not in disable:
-                check.rule_3_3()
-            if 'rule_3_4' not in disable:
-                check.rule_3_4()
-            if 'rule_4_1' not in disable:
-                check.rule_4_1()
-            if 'rule_4_2' not in disable:
-                check.rule_4_2()
-            if 'rule_4_3' not in disable:
-                check.rule_4_3()
-            if rtos and 'rule_4_4' not in disable:
-                check.rule_4_4()
-
-        erro_total = erro_total + check.erro_total
-        erro_log.append(check.erro_log)
+    if args.jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            # map() yields results in file order, keeping output deterministic
+            results = executor.map(
+                check_file_buffered,
+                files,
+                repeat(file),
+                repeat(rtos),
+                repeat(disable),
+                repeat(not args.xml),
+                repeat(args.cache_dir),
+            )
+            for output, file_erro_total, file_erro_log in results:
+                print(output, end="")
+                erro_total = erro_total + file_erro_total
+                erro_log.append(file_erro_log)
+    else:
+        for f in files:
+            file_erro_total, file_erro_log = check_file(
+                f, file, rtos, disable, not args.xml, args.cache_dir
+            )
+            erro_total = erro_total + file_erro_total
+            erro_log.append(file_erro_log)
 
     table = []
     for erro in erro_log:
@@ -704,8 +1157,8 @@ def main():
         writer.writerows(table)
         args.output_file.close()
 
-    if args.xml:
-        check.print_log_xml()
+    if args.xml and erro_log:
+        print_log_xml(erro_log[-1])
 
     sys.exit(erro_total)
 
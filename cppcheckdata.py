@@ -7,8 +7,14 @@ License: No restrictions, use this as you need.
 """
 
 import argparse
+import functools
+import hashlib
 import json
+import marshal
+import mmap
 import os
+import re
+import struct
 import subprocess
 import sys
 
@@ -31,16 +37,57 @@ except ImportError:
         sys.stderr.write('%s [%s]\n' % (message, error_id))
     sys.exit(1)
 
-from fnmatch import fnmatch
+from fnmatch import fnmatch, translate as fnmatch_translate
+from itertools import repeat
 from xml.etree import ElementTree
+from xml.sax.saxutils import unescape
+
+try:
+    from xml.parsers import expat
+except ImportError:
+    expat = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
 
 EXIT_CODE = 0
 
 current_dumpfile_suppressions = []
 
+class IdTable(dict):
+    """
+    Map the Id strings of a configuration to dense integers, so the links
+    between the objects are resolved through a list index. All null Ids map
+    to 0.
+    """
+
+    def __init__(self):
+        super().__init__({None: 0, '0': 0, '00000000': 0, '0000000000000000': 0, '0x0': 0})
+        self.size = 1
+
+    def __missing__(self, Id):
+        value = self[Id] = self.size
+        self.size += 1
+        return value
+
+
+class _RawIdTable(dict):
+    """Keep the Id strings as they are, for objects parsed outside a Configuration"""
+
+    def __missing__(self, Id):
+        return Id
+
+
+RAW_IDS = _RawIdTable()
+
+
 def _load_location(location, element):
     """Load location from element/dict"""
     location.file = element.get('file')
+    if location.file is not None:
+        location.file = sys.intern(location.file)
     line = element.get('line')
     if line is None:
         line = element.get('linenr')
@@ -150,20 +197,15 @@ class ValueType:
     ValueType class. Contains (promoted) type information for each node in the AST.
     """
 
-    type = None
-    sign = None
-    bits = 0
-    constness = 0
-    pointer = 0
-    typeScopeId = None
-    typeScope = None
-    originalTypeName = None
+    __slots__ = ('type', 'sign', 'bits', 'constness', 'pointer',
+                 'typeScopeId', 'typeScope', 'originalTypeName')
 
-    def __init__(self, element):
+    def __init__(self, element, ids=RAW_IDS):
         self.type = element.get('valueType-type')
         self.sign = element.get('valueType-sign')
         self.bits = int(element.get('valueType-bits', 0))
-        self.typeScopeId = element.get('valueType-typeScope')
+        self.typeScopeId = ids[element.get('valueType-typeScope')]
+        self.typeScope = None
         self.originalTypeName = element.get('valueType-originalTypeName')
         self.constness = int(element.get('valueType-constness', 0))
         self.pointer = int(element.get('valueType-pointer', 0))
@@ -229,8 +271,8 @@ class Token:
         variable           Variable information for this token. See the Variable class.
         function           If this token points at a function call, this attribute has the Function
                            information. See the Function class.
-        values             Possible/Known values of token
-        impossible_values  Impossible values of token
+        values             Possible/Known values of token, resolved on first access
+        impossible_values  Impossible values of token, resolved on first access
         valueType          type information
         typeScope          type scope (token->type()->classScope)
         astParent          ast parent
@@ -251,65 +293,50 @@ class Token:
     @endcode
     """
 
-    Id = None
-    str = None
-    next = None
-    previous = None
-    linkId = None
-    link = None
-    scopeId = None
-    scope = None
-    isName = False
-    isNumber = False
-    isInt = False
-    isFloat = False
-    isString = False
-    strlen = None
-    isChar = False
-    isOp = False
-    isArithmeticalOp = False
-    isAssignmentOp = False
-    isComparisonOp = False
-    isLogicalOp = False
-    isUnsigned = False
-    isSigned = False
-    isExpandedMacro = False
-    isRemovedVoidParameter = False
-    isSplittedVarDeclComma = False
-    isSplittedVarDeclEq = False
-    isImplicitInt = False
-    exprId = None
-    varId = None
-    variableId = None
-    variable = None
-    functionId = None
-    function = None
-    valuesId = None
-    values = None
-    impossible_values = None
-    valueType = None
-
-    typeScopeId = None
-    typeScope = None
-
-    astParentId = None
-    astParent = None
-    astOperand1Id = None
-    astOperand1 = None
-    astOperand2Id = None
-    astOperand2 = None
-
-    file = None
-    linenr = None
-    column = None
-
-    def __init__(self, element):
-        self.Id = element.get('id')
+    __slots__ = ('Id', 'str', 'next', 'previous', 'linkId', 'link', 'scopeId', 'scope',
+                 'isName', 'isNumber', 'isInt', 'isFloat', 'isString', 'strlen', 'isChar',
+                 'isOp', 'isArithmeticalOp', 'isAssignmentOp', 'isComparisonOp',
+                 'isLogicalOp', 'isUnsigned', 'isSigned', 'isExpandedMacro',
+                 'isRemovedVoidParameter', 'isSplittedVarDeclComma',
+                 'isSplittedVarDeclEq', 'isImplicitInt', 'exprId', 'varId',
+                 'variableId', 'variable', 'functionId', 'function', 'valuesId',
+                 '_values', '_impossible_values', '_valueflow', 'valueType', 'typeScopeId',
+                 'typeScope', 'astParentId', 'astParent', 'astOperand1Id',
+                 'astOperand1', 'astOperand2Id', 'astOperand2', 'file', 'linenr',
+                 'column')
+
+    # Id strings that setId() resolves into object references
+    LINK_IDS = ('linkId', 'scopeId', 'variableId', 'functionId', 'valuesId',
+                'typeScopeId', 'astParentId', 'astOperand1Id', 'astOperand2Id')
+
+    def __init__(self, element, ids=RAW_IDS):
+        self.Id = ids[element.get('id')]
         self.str = element.get('str')
+        if self.str is not None:
+            self.str = sys.intern(self.str)
         self.next = None
         self.previous = None
-        self.scopeId = element.get('scope')
+        self.scopeId = ids[element.get('scope')]
         self.scope = None
+        self.isName = False
+        self.isNumber = False
+        self.isInt = False
+        self.isFloat = False
+        self.isString = False
+        self.strlen = None
+        self.isChar = False
+        self.isOp = False
+        self.isArithmeticalOp = False
+        self.isAssignmentOp = False
+        self.isComparisonOp = False
+        self.isLogicalOp = False
+        self.isUnsigned = False
+        self.isSigned = False
+        self.isExpandedMacro = False
+        self.isRemovedVoidParameter = False
+        self.isSplittedVarDeclComma = False
+        self.isSplittedVarDeclEq = False
+        self.isImplicitInt = False
         type = element.get('type')
         if type == 'name':
             self.isName = True
@@ -348,29 +375,33 @@ class Token:
             self.isSplittedVarDeclEq = True
         if element.get('isImplicitInt'):
             self.isImplicitInt = True
-        self.linkId = element.get('link')
+        self.linkId = ids[element.get('link')]
         self.link = None
+        self.varId = None
         if element.get('varId'):
             self.varId = int(element.get('varId'))
+        self.exprId = None
         if element.get('exprId'):
             self.exprId = int(element.get('exprId'))
-        self.variableId = element.get('variable')
+        self.variableId = ids[element.get('variable')]
         self.variable = None
-        self.functionId = element.get('function')
+        self.functionId = ids[element.get('function')]
         self.function = None
-        self.valuesId = element.get('values')
-        self.values = None
+        self.valuesId = ids[element.get('values')]
+        self._values = None
+        self._impossible_values = None
+        self._valueflow = None
         if element.get('valueType-type'):
-            self.valueType = ValueType(element)
+            self.valueType = ValueType(element, ids)
         else:
             self.valueType = None
-        self.typeScopeId = element.get('type-scope')
+        self.typeScopeId = ids[element.get('type-scope')]
         self.typeScope = None
-        self.astParentId = element.get('astParent')
+        self.astParentId = ids[element.get('astParent')]
         self.astParent = None
-        self.astOperand1Id = element.get('astOperand1')
+        self.astOperand1Id = ids[element.get('astOperand1')]
         self.astOperand1 = None
-        self.astOperand2Id = element.get('astOperand2')
+        self.astOperand2Id = ids[element.get('astOperand2')]
         self.astOperand2 = None
         _load_location(self, element)
 
@@ -393,15 +424,9 @@ class Token:
         self.link = IdMap[self.linkId]
         self.variable = IdMap[self.variableId]
         self.function = IdMap[self.functionId]
-        self.values = []
-        self.impossible_values = []
-        if IdMap[self.valuesId]:
-            for v in IdMap[self.valuesId]:
-                if v.isImpossible():
-                    self.impossible_values.append(v)
-                else:
-                    self.values.append(v)
-                v.setId(IdMap)
+        self._values = []
+        self._impossible_values = []
+        self._valueflow = IdMap[self.valuesId]
         self.typeScope = IdMap[self.typeScopeId]
         self.astParent = IdMap[self.astParentId]
         self.astOperand1 = IdMap[self.astOperand1Id]
@@ -409,6 +434,36 @@ class Token:
         if self.valueType:
             self.valueType.setId(IdMap)
 
+    def _load_values(self):
+        valueflow = self._valueflow
+        self._valueflow = None
+        valueflow.setValuesId()
+        for v in valueflow.values:
+            if v.isImpossible():
+                self._impossible_values.append(v)
+            else:
+                self._values.append(v)
+
+    @property
+    def values(self):
+        if self._valueflow is not None:
+            self._load_values()
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self._values = values
+
+    @property
+    def impossible_values(self):
+        if self._valueflow is not None:
+            self._load_values()
+        return self._impossible_values
+
+    @impossible_values.setter
+    def impossible_values(self, values):
+        self._impossible_values = values
+
     def getValue(self, v):
         """
         Get value if it exists
@@ -495,31 +550,22 @@ class Scope:
         type           Type of scope: Global, Function, Class, If, While
     """
 
-    Id = None
-    bodyStartId = None
-    bodyStart = None
-    bodyEndId = None
-    bodyEnd = None
-    className = None
-    functionId = None
-    function = None
-    nestedInId = None
-    nestedIn = None
-    type = None
-    isExecutable = None
-    varlistId = None
-    varlist = None
+    __slots__ = ('Id', 'bodyStartId', 'bodyStart', 'bodyEndId', 'bodyEnd', 'className',
+                 'functionId', 'function', 'nestedInId', 'nestedIn', 'type',
+                 'isExecutable', 'varlistId', 'varlist')
 
-    def __init__(self, element):
-        self.Id = element.get('id')
+    LINK_IDS = ('bodyStartId', 'bodyEndId', 'functionId', 'nestedInId', 'varlistId')
+
+    def __init__(self, element, ids=RAW_IDS):
+        self.Id = ids[element.get('id')]
         self.className = element.get('className')
-        self.functionId = element.get('function')
+        self.functionId = ids[element.get('function')]
         self.function = None
-        self.bodyStartId = element.get('bodyStart')
+        self.bodyStartId = ids[element.get('bodyStart')]
         self.bodyStart = None
-        self.bodyEndId = element.get('bodyEnd')
+        self.bodyEndId = ids[element.get('bodyEnd')]
         self.bodyEnd = None
-        self.nestedInId = element.get('nestedIn')
+        self.nestedInId = ids[element.get('nestedIn')]
         self.nestedIn = None
         self.type = element.get('type')
         self.isExecutable = (self.type in ('Function', 'If', 'Else', 'For', 'While', 'Do',
@@ -541,7 +587,7 @@ class Scope:
         self.nestedIn = IdMap[self.nestedInId]
         self.function = IdMap[self.functionId]
         for v in self.varlistId:
-            value = IdMap.get(v)
+            value = IdMap[v]
             if value:
                 self.varlist.append(value)
 
@@ -562,25 +608,18 @@ class Function:
         isStatic                Is this function static?
     """
 
-    Id = None
-    argument = None
-    argumentId = None
-    token = None
-    tokenId = None
-    tokenDef = None
-    tokenDefId = None
-    name = None
-    type = None
-    isVirtual = None
-    isImplicitlyVirtual = None
-    isInlineKeyword = None
-    isStatic = None
-    nestedIn = None
-
-    def __init__(self, element, nestedIn):
-        self.Id = element.get('id')
-        self.tokenId = element.get('token')
-        self.tokenDefId = element.get('tokenDef')
+    __slots__ = ('Id', 'argument', 'argumentId', 'token', 'tokenId', 'tokenDef',
+                 'tokenDefId', 'name', 'type', 'isVirtual', 'isImplicitlyVirtual',
+                 'isInlineKeyword', 'isStatic', 'nestedIn')
+
+    LINK_IDS = ('argumentId', 'tokenId', 'tokenDefId')
+
+    def __init__(self, element, nestedIn, ids=RAW_IDS):
+        self.Id = ids[element.get('id')]
+        self.tokenId = ids[element.get('token')]
+        self.token = None
+        self.tokenDefId = ids[element.get('tokenDef')]
+        self.tokenDef = None
         self.name = element.get('name')
         self.type = element.get('type')
         self.isImplicitlyVirtual = element.get('isImplicitlyVirtual', 'false') == 'true'
@@ -591,7 +630,6 @@ class Function:
 
         self.argument = {}
         self.argumentId = {}
-       # breakpoint()
 
     def __repr__(self):
         attrs = ["Id", "tokenId", "tokenDefId", "name", "type", "isVirtual",
@@ -604,7 +642,7 @@ class Function:
     def setId(self, IdMap):
         for argnr, argid in self.argumentId.items():
             self.argument[argnr] = IdMap[argid]
-        self.token = IdMap.get(self.tokenId, None)
+        self.token = IdMap[self.tokenId]
         self.tokenDef = IdMap[self.tokenDefId]
 
 
@@ -633,39 +671,24 @@ class Variable:
         constness       Variable constness (same encoding as ValueType::constness)
     """
 
-    Id = None
-    nameTokenId = None
-    nameToken = None
-    typeStartTokenId = None
-    typeStartToken = None
-    typeEndTokenId = None
-    typeEndToken = None
-    access = None
-    scopeId = None
-    scope = None
-    isArgument = False
-    isArray = False
-    isClass = False
-    isConst = False
-    isExtern = False
-    isGlobal = False
-    isLocal = False
-    isPointer = False
-    isReference = False
-    isStatic = False
-    isVolatile = False
-    constness = 0
+    __slots__ = ('Id', 'nameTokenId', 'nameToken', 'typeStartTokenId', 'typeStartToken',
+                 'typeEndTokenId', 'typeEndToken', 'access', 'scopeId', 'scope',
+                 'isArgument', 'isArray', 'isClass', 'isConst', 'isExtern', 'isGlobal',
+                 'isLocal', 'isPointer', 'isReference', 'isStatic', 'isVolatile',
+                 'constness')
 
-    def __init__(self, element):
-        self.Id = element.get('id')
-        self.nameTokenId = element.get('nameToken')
+    LINK_IDS = ('nameTokenId', 'typeStartTokenId', 'typeEndTokenId', 'scopeId')
+
+    def __init__(self, element, ids=RAW_IDS):
+        self.Id = ids[element.get('id')]
+        self.nameTokenId = ids[element.get('nameToken')]
         self.nameToken = None
-        self.typeStartTokenId = element.get('typeStartToken')
+        self.typeStartTokenId = ids[element.get('typeStartToken')]
         self.typeStartToken = None
-        self.typeEndTokenId = element.get('typeEndToken')
+        self.typeEndTokenId = ids[element.get('typeEndToken')]
         self.typeEndToken = None
         self.access = element.get('access')
-        self.scopeId = element.get('scope')
+        self.scopeId = ids[element.get('scope')]
         self.scope = None
         self.isArgument = (self.access and self.access == 'Argument')
         self.isArray = element.get('isArray') == 'true'
@@ -726,13 +749,12 @@ class Value:
         inconclusive     Is value inconclusive?
     """
 
-    intvalue = None
-    tokvalue = None
-    floatvalue = None
-    containerSize = None
-    condition = None
-    valueKind = None
-    inconclusive = False
+    __slots__ = ('intvalue', 'tokvalue', 'floatvalue', 'containerSize', 'iteratorStart',
+                 'iteratorEnd', 'lifetime', 'lifetimeScope', 'lifetimeKind', 'symbolic',
+                 'symbolicDelta', 'condition', 'bound', 'path', 'valueKind',
+                 'inconclusive', '_tokvalueId', '_lifetimeId', '_symbolicId')
+
+    LINK_IDS = ('_tokvalueId', '_lifetimeId', '_symbolicId')
 
     def isKnown(self):
         return self.valueKind and self.valueKind == 'known'
@@ -743,38 +765,43 @@ class Value:
     def isImpossible(self):
         return self.valueKind and self.valueKind == 'impossible'
 
-    def __init__(self, element):
+    def __init__(self, element, ids=RAW_IDS):
         self.intvalue = element.get('intvalue')
         if self.intvalue:
             self.intvalue = int(self.intvalue)
-        self._tokvalueId = element.get('tokvalue')
+        self._tokvalueId = ids[element.get('tokvalue')]
+        self.tokvalue = None
         self.floatvalue = element.get('floatvalue')
         self.containerSize = element.get('container-size')
         self.iteratorStart = element.get('iterator-start')
         self.iteratorEnd = element.get('iterator-end')
-        self._lifetimeId = element.get('lifetime')
+        self._lifetimeId = ids[element.get('lifetime')]
+        self.lifetime = None
         self.lifetimeScope = element.get('lifetime-scope')
         self.lifetimeKind = element.get('lifetime-kind')
-        self._symbolicId = element.get('symbolic')
+        self._symbolicId = ids[element.get('symbolic')]
+        self.symbolic = None
         self.symbolicDelta = element.get('symbolic-delta')
         self.condition = element.get('condition-line')
         self.bound = element.get('bound')
         self.path = element.get('path')
         if self.condition:
             self.condition = int(self.condition)
+        self.valueKind = None
         if element.get('known'):
             self.valueKind = 'known'
         elif element.get('possible'):
             self.valueKind = 'possible'
         elif element.get('impossible'):
             self.valueKind = 'impossible'
+        self.inconclusive = False
         if element.get('inconclusive'):
             self.inconclusive = True
 
     def setId(self, IdMap):
-        self.tokvalue = IdMap.get(self._tokvalueId)
-        self.lifetime = IdMap.get(self._lifetimeId)
-        self.symbolic = IdMap.get(self._symbolicId)
+        self.tokvalue = IdMap[self._tokvalueId]
+        self.lifetime = IdMap[self._lifetimeId]
+        self.symbolic = IdMap[self._symbolicId]
 
     def __repr__(self):
         attrs = ["intvalue", "tokvalue", "floatvalue", "containerSize",
@@ -800,9 +827,20 @@ class ValueFlow:
     Id = None
     values = None
 
-    def __init__(self, element):
-        self.Id = element.get('id')
+    def __init__(self, element, ids=RAW_IDS):
+        self.Id = ids[element.get('id')]
         self.values = []
+        self.IdMap = None
+
+    def setId(self, IdMap):
+        # The values are resolved by setValuesId() when a token needs them
+        self.IdMap = IdMap
+
+    def setValuesId(self):
+        if self.IdMap is not None:
+            for value in self.values:
+                value.setId(self.IdMap)
+            self.IdMap = None
 
     def __repr__(self):
         attrs = ["Id", "values"]
@@ -851,6 +889,102 @@ class Suppression:
         return False
 
 
+def _has_wildcard(pattern):
+    return '*' in pattern or '?' in pattern or '[' in pattern
+
+
+def _glob_match(pattern):
+    """Return a match function that is equivalent to fnmatch() with pattern"""
+    return re.compile(fnmatch_translate(os.path.normcase(pattern))).match
+
+
+class _SuppressionBucket:
+    """Suppressions with the same errorId pattern, grouped by fileName"""
+
+    __slots__ = ('files', 'other')
+
+    def __init__(self):
+        # normalized fileName -> [(lineNumber, symbol match)]
+        self.files = {}
+        # [(fileName match or None, lineNumber, symbol match)]
+        self.other = []
+
+    def add(self, suppression):
+        line = None
+        if suppression.lineNumber is not None:
+            line = int(suppression.lineNumber)
+        symbol_match = None
+        if suppression.symbolName is not None:
+            symbol_match = _glob_match('*' + suppression.symbolName + '*')
+        fileName = suppression.fileName
+        if fileName is not None and not _has_wildcard(fileName):
+            self.files.setdefault(os.path.normcase(fileName), []).append((line, symbol_match))
+        elif fileName is None:
+            self.other.append((None, line, symbol_match))
+        else:
+            self.other.append((_glob_match(fileName), line, symbol_match))
+
+    def isMatch(self, file, line, message):
+        for line_nr, symbol_match in self.files.get(file, ()):
+            if ((line_nr is None or int(line) == line_nr)
+                    and (symbol_match is None or symbol_match(message))):
+                return True
+        for file_match, line_nr, symbol_match in self.other:
+            if ((file_match is None or (file is not None and file_match(file)))
+                    and (line_nr is None or int(line) == line_nr)
+                    and (symbol_match is None or symbol_match(message))):
+                return True
+        return False
+
+
+class SuppressionIndex:
+    """
+    The suppressions of a dump file indexed for is_suppressed().
+
+    Suppressions with an exact errorId and fileName are looked up in dicts,
+    wildcard patterns are compiled once. Matching is the same as
+    Suppression.isMatch().
+    """
+
+    def __init__(self, suppressions):
+        self.suppressions = suppressions
+        self.size = len(suppressions)
+        # errorId -> _SuppressionBucket
+        self.error_ids = {}
+        # [(errorId match, _SuppressionBucket)]
+        self.error_id_patterns = []
+        patterns = {}
+        for suppression in suppressions:
+            errorId = suppression.errorId
+            if errorId is None:
+                continue
+            errorId = os.path.normcase(errorId)
+            if not _has_wildcard(errorId):
+                bucket = self.error_ids.setdefault(errorId, _SuppressionBucket())
+            elif errorId in patterns:
+                bucket = patterns[errorId]
+            else:
+                bucket = patterns[errorId] = _SuppressionBucket()
+                self.error_id_patterns.append((re.compile(fnmatch_translate(errorId)).match, bucket))
+            bucket.add(suppression)
+
+    def isUpToDate(self, suppressions):
+        return self.suppressions is suppressions and self.size == len(suppressions)
+
+    def isMatch(self, file, line, message, errorId):
+        if file is not None:
+            file = os.path.normcase(file)
+        message = os.path.normcase(message)
+        errorId = os.path.normcase(errorId)
+        bucket = self.error_ids.get(errorId)
+        if bucket is not None and bucket.isMatch(file, line, message):
+            return True
+        for errorId_match, bucket in self.error_id_patterns:
+            if errorId_match(errorId) and bucket.isMatch(file, line, message):
+                return True
+        return False
+
+
 class Configuration:
     """
     Configuration class
@@ -868,6 +1002,8 @@ class Configuration:
         variables     List of Variable items
         valueflow     List of ValueFlow values
         standards     List of Standards values
+        ids           IdTable of the parsed Id strings
+        arguments     List of function argument Variable items not in variables
     """
 
     name = ''
@@ -896,6 +1032,8 @@ class Configuration:
         self.valueflow = []
         self.standards = Standards()
         self.clang_warnings = []
+        self.ids = IdTable()
+        self.arguments = []
 
     def set_tokens_links(self):
         """Set next/previous links between tokens."""
@@ -907,7 +1045,7 @@ class Configuration:
             prev = token
 
     def set_id_map(self, arguments):
-        IdMap = {None: None, '0': None, '00000000': None, '0000000000000000': None, '0x0': None}
+        IdMap = [None] * self.ids.size
         for token in self.tokenlist:
             IdMap[token.Id] = token
         for scope in self.scopes:
@@ -919,7 +1057,7 @@ class Configuration:
         for variable in arguments:
             IdMap[variable.Id] = variable
         for values in self.valueflow:
-            IdMap[values.Id] = values.values
+            IdMap[values.Id] = values
         for token in self.tokenlist:
             token.setId(IdMap)
         for scope in self.scopes:
@@ -930,13 +1068,27 @@ class Configuration:
             variable.setId(IdMap)
         for variable in arguments:
             variable.setId(IdMap)
+        for values in self.valueflow:
+            values.setId(IdMap)
+
+    def drop_ids(self, arguments):
+        """Release the Id strings of the links resolved by set_id_map.
+        The values are resolved lazily and keep their Ids."""
+        for objects in (self.tokenlist, self.scopes, self.functions, self.variables, arguments):
+            for obj in objects:
+                for attr in obj.LINK_IDS:
+                    setattr(obj, attr, None)
 
-    def setIdMap(self, functions_arguments):
+    def setIdMap(self, functions_arguments, drop_ids=False):
         """Set relationships between objects stored in this configuration.
         :param functions_arguments: List of Variable objects which are function arguments
+        :param drop_ids: Release the link Id strings once they are resolved
         """
+        self.arguments = functions_arguments
         self.set_tokens_links()
         self.set_id_map(functions_arguments)
+        if drop_ids:
+            self.drop_ids(functions_arguments)
 
 
 class Platform:
@@ -1012,6 +1164,201 @@ class Standards:
         )
 
 
+def _iterparse_etree(filename, cfg_filter=None):
+    """
+    ElementTree parser backend
+    """
+    for event, node in ElementTree.iterparse(filename, events=('start', 'end')):
+        yield event, node.tag, node.attrib
+        if event == 'end':
+            # Remove links to the sibling nodes
+            node.clear()
+
+
+def _iterparse_lxml(filename, cfg_filter=None):
+    """
+    lxml parser backend
+    """
+    for event, node in lxml_etree.iterparse(filename, events=('start', 'end'), huge_tree=True):
+        yield event, node.tag, node.attrib
+        if event == 'end':
+            node.clear()
+            # lxml keeps the processed siblings linked to the parent
+            while node.getprevious() is not None:
+                del node.getparent()[0]
+
+
+def _expat_events(chunks):
+    """
+    Parse the XML document fed as bytes-like chunks with expat, attributes
+    are reported as plain dicts without building an element tree
+    """
+    events = []
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = lambda tag, attrib: events.append(('start', tag, attrib))
+    parser.EndElementHandler = lambda tag: events.append(('end', tag, None))
+    for chunk in chunks:
+        parser.Parse(chunk, False)
+        for event in events:
+            yield event
+        del events[:]
+    parser.Parse(b'', True)
+    for event in events:
+        yield event
+
+
+def _file_chunks(filename):
+    with open(filename, 'rb') as f:
+        for data in iter(lambda: f.read(1 << 16), b''):
+            yield data
+
+
+def _iterparse_expat(filename, cfg_filter=None):
+    """
+    expat parser backend
+    """
+    return _expat_events(_file_chunks(filename))
+
+
+def _build_dump_index(m):
+    index = []
+    start = m.find(b'<dump cfg="')
+    while start >= 0:
+        name_start = start + len(b'<dump cfg="')
+        name_end = m.find(b'"', name_start)
+        end = m.find(b'</dump>', name_end)
+        if name_end < 0 or end < 0:
+            # truncated file, let the parser report it
+            break
+        end += len(b'</dump>')
+        name = unescape(m[name_start:name_end].decode('utf-8'), {'&quot;': '"', '&apos;': "'"})
+        index.append((name, start, end))
+        start = m.find(b'<dump cfg="', end)
+    return tuple(index)
+
+
+# Only the last few dump files are kept: a dump is read again by the later
+# iterconfigurations() calls of its CppcheckData, not across files
+@functools.lru_cache(maxsize=8)
+def _cached_dump_index(filename, size, mtime_ns):
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return _build_dump_index(m)
+
+
+def dump_index(filename):
+    """
+    Return the (configuration name, start offset, end offset) of each
+    <dump> node of a dump file. Building the index scans the whole file
+    for the node boundaries (a byte search, nothing is parsed), it is kept
+    in memory while the file is unchanged.
+    """
+    stat = os.stat(filename)
+    return _cached_dump_index(os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+
+
+def read_trailing_suppressions(filename):
+    """
+    Return the Suppressions of the <suppressions> node that cppcheck writes
+    after the last <dump> node. Only the tail of the file is read.
+    """
+    if os.path.getsize(filename) == 0:
+        return []
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        last_dump = m.rfind(b'</dump>')
+        if last_dump < 0:
+            return []
+        start = m.find(b'<suppressions', last_dump)
+        end = m.find(b'</suppressions>', start)
+        if start < 0 or end < 0:
+            # no suppressions, or an empty <suppressions/> node
+            return []
+        node = ElementTree.fromstring(m[start:end + len(b'</suppressions>')])
+    return [Suppression(element.attrib) for element in node.iter('suppression')]
+
+
+def _mmap_chunks(view, segments, size=1 << 20):
+    for start, end in segments:
+        for pos in range(start, end, size):
+            with view[pos:min(pos + size, end)] as chunk:
+                yield chunk
+
+
+def _iterparse_mmap(filename, cfg_filter=None):
+    """
+    expat parser backend fed straight from a memory mapping of the file.
+    The <dump> nodes rejected by cfg_filter are not parsed, the parser is
+    fed the rest of the file around them. Their bytes are still read once
+    by dump_index() to find where they end.
+    """
+    if os.path.getsize(filename) == 0:
+        # empty files can't be mapped
+        return _iterparse_expat(filename)
+    return _iterparse_mmap_events(filename, cfg_filter)
+
+
+def _iterparse_mmap_events(filename, cfg_filter):
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        segments = [(0, len(m))]
+        if cfg_filter is not None:
+            segments = []
+            pos = 0
+            for name, start, end in dump_index(filename):
+                if not cfg_filter(name):
+                    segments.append((pos, start))
+                    pos = end
+            segments.append((pos, len(m)))
+        with memoryview(m) as view:
+            for event in _expat_events(_mmap_chunks(view, segments)):
+                yield event
+
+
+PARSER_BACKENDS = {'etree': _iterparse_etree}
+if expat is not None:
+    PARSER_BACKENDS['expat'] = _iterparse_expat
+    PARSER_BACKENDS['mmap'] = _iterparse_mmap
+if lxml_etree is not None:
+    PARSER_BACKENDS['lxml'] = _iterparse_lxml
+
+
+def iterparse(filename, backend=None, cfg_filter=None):
+    """
+    Iterate (event, tag, attributes) tuples of a dump file. The attributes
+    support get(), the attributes of 'end' events may be None.
+
+    :param backend: Name of the parser backend in PARSER_BACKENDS, by default
+                    lxml is used when installed, then mmap, expat and
+                    ElementTree. With a cfg_filter mmap is preferred since it
+                    can skip the rejected configurations without parsing them.
+    :param cfg_filter: Function called with each configuration name, the
+                    backends may leave out the <dump> nodes it rejects
+    """
+    if backend is None:
+        order = ('lxml', 'mmap', 'expat', 'etree')
+        if cfg_filter is not None:
+            order = ('mmap', 'lxml', 'expat', 'etree')
+        for backend in order:
+            if backend in PARSER_BACKENDS:
+                break
+    return PARSER_BACKENDS[backend](filename, cfg_filter)
+
+
+# Sections of a dump file that CppcheckData can load, and the XML node
+# enclosing each of them
+SECTIONS = {
+    'rawtokens': 'rawtokens',
+    'standards': 'standards',
+    'directives': 'directivelist',
+    'macro_usage': 'macro-usage',
+    'preprocessor_if_conditions': 'simplecpp-if-cond',
+    'clang_warnings': 'clang-warning',
+    'tokenlist': 'tokenlist',
+    'scopes': 'scopes',
+    'variables': 'variables',
+    'typedefInfo': 'typedef-info',
+    'valueflow': 'valueflow',
+}
+
+
 class CppcheckData:
     """
     Class that makes cppcheck dump data available
@@ -1051,63 +1398,127 @@ class CppcheckData:
     @endcode
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, backend=None, drop_ids=False, load_valueflow=True, sections=None,
+                 cfg_filter=None):
         """
         :param filename: Path to Cppcheck dump file
+        :param backend:  Parser backend name, see iterparse()
+        :param drop_ids: Release the link Id strings (astParentId, valuesId, ...)
+                         of the configurations once they are resolved
+        :param load_valueflow: Parse the <valueflow> sections. When False all
+                         token values are empty.
+        :param sections: Names of the SECTIONS to load, all by default. The
+                         other sections are skipped while parsing and stay
+                         empty. Functions are part of 'scopes'.
+        :param cfg_filter: Function called with each configuration name, the
+                         <dump> nodes it rejects are skipped while parsing
         """
+        if sections is None:
+            sections = SECTIONS
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            raise ValueError('Unknown dump sections: %s' % ', '.join(sorted(unknown)))
+        self.sections = set(sections)
+        if not load_valueflow:
+            self.sections.discard('valueflow')
+        # XML nodes of the configurations that are not parsed
+        self._skip_tags = {SECTIONS[section] for section in SECTIONS if section not in self.sections}
+
         self.filename = filename
+        self.backend = backend
+        self.drop_ids = drop_ids
+        self.cfg_filter = cfg_filter
+        self.load_valueflow = 'valueflow' in self.sections
         self.rawTokens = []
         self.platform = None
         self.suppressions = []
         self.files = []
-
-        platform_done = False
-        rawtokens_done = False
-        suppressions_done = False
-
-        # Parse general configuration options from <dumps> node
-        # We intentionally don't clean node resources here because we
-        # want to serialize in memory only small part of the XML tree.
-        for event, node in ElementTree.iterparse(self.filename, events=('start', 'end')):
-            if platform_done and rawtokens_done and suppressions_done:
+        self._configurations = None
+
+        # The file is parsed in a single pass: the general configuration
+        # options from <dumps> (platform, rawtokens) precede the first <dump>
+        # node, they are read here and iterconfigurations() resumes the same
+        # stream from that <dump> node.
+        self._events = iterparse(self.filename, self.backend, self.cfg_filter)
+        self._first_dump = None
+        self._header_node = None
+        for event, tag, attrib in self._events:
+            if tag == 'dump' and event == 'start':
+                self._first_dump = attrib
                 break
-            if node.tag == 'platform' and event == 'start':
-                self.platform = Platform(node)
-                platform_done = True
-            elif node.tag == 'rawtokens' and event == 'end':
-                for rawtokens_node in node:
-                    if rawtokens_node.tag == 'file':
-                        self.files.append(rawtokens_node.get('name'))
-                    elif rawtokens_node.tag == 'tok':
-                        tok = Token(rawtokens_node)
-                        tok.file = self.files[int(rawtokens_node.get('fileIndex'))]
-                        self.rawTokens.append(tok)
-                rawtokens_done = True
-            elif node.tag == 'suppressions' and event == 'end':
-                for suppressions_node in node:
-                    self.suppressions.append(Suppression(suppressions_node))
-                suppressions_done = True
+            self._parse_header_node(event, tag, attrib)
+
+        if self._first_dump is not None:
+            # cppcheck writes the suppressions after the configurations, they
+            # must be known before the first configuration is checked
+            self.suppressions.extend(read_trailing_suppressions(self.filename))
 
         global current_dumpfile_suppressions
         current_dumpfile_suppressions = self.suppressions
 
-        # Set links between rawTokens.
+        self._set_raw_tokens_links()
+
+    def _set_raw_tokens_links(self):
         for i in range(len(self.rawTokens)-1):
             self.rawTokens[i+1].previous = self.rawTokens[i]
             self.rawTokens[i].next = self.rawTokens[i+1]
 
+    def _parse_header_node(self, event, tag, attrib):
+        if tag == 'platform' and event == 'start':
+            self.platform = Platform(attrib)
+        elif tag in ('rawtokens', 'suppressions'):
+            self._header_node = tag if event == 'start' else None
+        elif event != 'start':
+            return
+        elif self._header_node == 'rawtokens':
+            if tag == 'file':
+                self.files.append(attrib.get('name'))
+            elif tag == 'tok' and 'rawtokens' in self.sections:
+                tok = Token(attrib)
+                tok.file = self.files[int(attrib.get('fileIndex'))]
+                self.rawTokens.append(tok)
+        elif self._header_node == 'suppressions' and tag == 'suppression':
+            # Extends the list shared with current_dumpfile_suppressions
+            self.suppressions.append(Suppression(attrib))
+
+    def _iterevents(self):
+        """
+        XML events from the first <dump> node on. The first call resumes the
+        stream opened by __init__, later calls parse the file again.
+        """
+        if self._events is None:
+            for event in iterparse(self.filename, self.backend, self.cfg_filter):
+                yield event
+            return
+
+        events = self._events
+        self._events = None
+        if self._first_dump is None:
+            return
+        yield 'start', 'dump', self._first_dump
+        for event in events:
+            yield event
+
     @property
     def configurations(self):
         """
         Return the list of all available Configuration objects.
         """
-        return list(self.iterconfigurations())
+        if self._configurations is None:
+            self._configurations = list(self.iterconfigurations())
+        return self._configurations
 
     def iterconfigurations(self):
         """
         Create and return iterator for the available Configuration objects.
         The iterator loops over all Configurations in the dump file tree, in document order.
         """
+        if self._configurations is not None:
+            # already loaded by the configurations property
+            for cfg in self._configurations:
+                yield cfg
+            return
+
         cfg = None
         cfg_arguments = []  # function arguments for Configuration node initialization
         cfg_function = None
@@ -1119,117 +1530,133 @@ class CppcheckData:
         # Iterating <typedef-info>
         iter_typedef_info = False
 
+        # Skipping the nodes of an unrequested section
+        skip_tags = self._skip_tags
+        skip_tag = None
+
         # Use iterable objects to traverse XML tree for dump files incrementally.
         # Iterative approach is required to avoid large memory consumption.
-        # Calling .clear() is necessary to let the element be garbage collected.
-        for event, node in ElementTree.iterparse(self.filename, events=('start', 'end')):
+        # The parser backends release the nodes once their end is reported.
+        for event, tag, node in self._iterevents():
+            if skip_tag is not None:
+                if tag == skip_tag and event == 'end':
+                    skip_tag = None
+                continue
+            elif tag in skip_tags:
+                if event == 'start':
+                    skip_tag = tag
+                continue
+
             # Serialize new configuration node
-            if node.tag == 'dump':
+            if tag == 'dump':
                 if event == 'start':
+                    if self.cfg_filter is not None and not self.cfg_filter(node.get('cfg')):
+                        skip_tag = tag
+                        continue
                     cfg = Configuration(node.get('cfg'))
                     continue
                 elif event == 'end':
-                    cfg.setIdMap(cfg_arguments)
-                    yield cfg
-                    cfg = None
+                    cfg.setIdMap(cfg_arguments, self.drop_ids)
+                    # Drop the references of this frame to the configuration
+                    # before it is handed out, so the caller can release it
+                    loaded = [cfg]
+                    cfg = cfg_function = cfg_valueflow = var = None
                     cfg_arguments = []
+                    yield loaded.pop()
 
-            elif node.tag == 'clang-warning' and event == 'start':
+            elif tag == 'clang-warning' and event == 'start':
                 cfg.clang_warnings.append({'file': node.get('file'),
                                            'line': int(node.get('line')),
                                            'column': int(node.get('column')),
                                            'message': node.get('message')})
 
             # Parse standards
-            elif node.tag == "standards" and event == 'start':
+            elif tag == "standards" and event == 'start':
                 continue
-            elif node.tag == 'c' and event == 'start':
+            elif tag == 'c' and event == 'start':
                 cfg.standards.set_c(node)
-            elif node.tag == 'cpp' and event == 'start':
+            elif tag == 'cpp' and event == 'start':
                 cfg.standards.set_cpp(node)
-            elif node.tag == 'posix' and event == 'start':
+            elif tag == 'posix' and event == 'start':
                 cfg.standards.set_posix(node)
 
             # Parse directives list
-            elif node.tag == 'directive' and event == 'start':
+            elif tag == 'directive' and event == 'start':
                 cfg.directives.append(Directive(node))
 
             # Parse macro usage
-            elif node.tag == 'macro' and event == 'start':
+            elif tag == 'macro' and event == 'start':
                 cfg.macro_usage.append(MacroUsage(node))
 
             # Preprocessor #if/#elif condition
-            elif node.tag == "if-cond" and event == 'start':
+            elif tag == "if-cond" and event == 'start':
                 cfg.preprocessor_if_conditions.append(PreprocessorIfCondition(node))
 
             # Parse tokens
-            elif node.tag == 'tokenlist' and event == 'start':
+            elif tag == 'tokenlist' and event == 'start':
                 continue
-            elif node.tag == 'token' and event == 'start':
-                cfg.tokenlist.append(Token(node))
+            elif tag == 'token' and event == 'start':
+                cfg.tokenlist.append(Token(node, cfg.ids))
 
             # Parse scopes
-            elif node.tag == 'scopes' and event == 'start':
+            elif tag == 'scopes' and event == 'start':
                 continue
-            elif node.tag == 'scope' and event == 'start':
-                cfg.scopes.append(Scope(node))
-            elif node.tag == 'varlist':
+            elif tag == 'scope' and event == 'start':
+                cfg.scopes.append(Scope(node, cfg.ids))
+            elif tag == 'varlist':
                 if event == 'start':
                     iter_scope_varlist = True
                 elif event == 'end':
                     iter_scope_varlist = False
 
             # Parse functions
-            elif node.tag == 'functionList' and event == 'start':
+            elif tag == 'functionList' and event == 'start':
                 continue
-            elif node.tag == 'function':
+            elif tag == 'function':
                 if event == 'start':
-                    cfg_function = Function(node, cfg.scopes[-1])
+                    cfg_function = Function(node, cfg.scopes[-1], cfg.ids)
                     continue
                 elif event == 'end':
                     cfg.functions.append(cfg_function)
                     cfg_function = None
 
             # Parse function arguments
-            elif node.tag == 'arg' and event == 'start':
+            elif tag == 'arg' and event == 'start':
                 arg_nr = int(node.get('nr'))
-                arg_variable_id = node.get('variable')
+                arg_variable_id = cfg.ids[node.get('variable')]
                 cfg_function.argumentId[arg_nr] = arg_variable_id
 
             # Parse variables
-            elif node.tag == 'var' and event == 'start':
+            elif tag == 'var' and event == 'start':
                 if iter_scope_varlist:
-                    cfg.scopes[-1].varlistId.append(node.get('id'))
+                    cfg.scopes[-1].varlistId.append(cfg.ids[node.get('id')])
                 else:
-                    var = Variable(node)
+                    var = Variable(node, cfg.ids)
                     if var.nameTokenId:
                         cfg.variables.append(var)
                     else:
                         cfg_arguments.append(var)
 
             # Parse typedef info
-            elif node.tag == 'typedef-info':
+            elif tag == 'typedef-info':
                 iter_typedef_info = (event == 'start')
-            elif iter_typedef_info and node.tag == 'info' and event == 'start':
+            elif iter_typedef_info and tag == 'info' and event == 'start':
                 cfg.typedefInfo.append(TypedefInfo(node))
 
             # Parse valueflows (list of values)
-            elif node.tag == 'valueflow' and event == 'start':
+            elif tag == 'valueflow' and event == 'start':
                 continue
-            elif node.tag == 'values':
+            elif tag == 'values':
                 if event == 'start':
-                    cfg_valueflow = ValueFlow(node)
+                    cfg_valueflow = ValueFlow(node, cfg.ids)
                     continue
                 elif event == 'end':
                     cfg.valueflow.append(cfg_valueflow)
                     cfg_valueflow = None
 
             # Parse values
-            elif node.tag == 'value' and event == 'start':
-                cfg_valueflow.values.append(Value(node))
-
-            # Remove links to the sibling nodes
-            node.clear()
+            elif tag == 'value' and event == 'start':
+                cfg_valueflow.values.append(Value(node, cfg.ids))
 
     def __repr__(self):
         attrs = ["configurations", "platform"]
@@ -1258,10 +1685,236 @@ def getArguments(ftok):
     return args
 
 
-def parsedump(filename):
+# Model cache: a header followed by the model of a dump file as nested lists
+# and dicts of strings, numbers and None, serialized with marshal. Loading it
+# only rebuilds these values, unlike pickle it never imports or calls code.
+# The links between the objects are restored with setIdMap().
+MODEL_CACHE_MAGIC = b'CPPCKDMP'
+MODEL_CACHE_VERSION = 2
+MODEL_CACHE_HEADER = struct.Struct('<8sIQ32s')  # magic, version, dump size, dump sha256
+
+
+def _model_fields(cls, *links):
+    """Slots of cls that are stored in the model cache"""
+    return tuple(name for name in cls.__slots__ if name not in links)
+
+
+_VALUETYPE_FIELDS = _model_fields(ValueType, 'typeScope')
+_TOKEN_FIELDS = _model_fields(Token, 'next', 'previous', 'link', 'scope', 'variable',
+                              'function', '_values', '_impossible_values', '_valueflow',
+                              'valueType', 'typeScope', 'astParent', 'astOperand1',
+                              'astOperand2')
+_SCOPE_FIELDS = _model_fields(Scope, 'bodyStart', 'bodyEnd', 'function', 'nestedIn', 'varlist')
+_FUNCTION_FIELDS = _model_fields(Function, 'argument', 'token', 'tokenDef', 'nestedIn')
+_VARIABLE_FIELDS = _model_fields(Variable, 'nameToken', 'typeStartToken', 'typeEndToken', 'scope')
+_VALUE_FIELDS = _model_fields(Value, 'tokvalue', 'lifetime', 'symbolic')
+
+
+def _model_rows(objects, fields):
+    return [[getattr(obj, name) for name in fields] for obj in objects]
+
+
+def _model_objects(cls, fields, rows):
+    """Create slotted objects from their stored rows, the links are None"""
+    links = [name for name in cls.__slots__ if name not in fields]
+    names = links + list(fields)
+    defaults = [None] * len(links)
+    objects = []
+    for row in rows:
+        obj = cls.__new__(cls)
+        # setattr() returns None, so any() runs all the calls of the map
+        # without a Python level loop
+        any(map(setattr, repeat(obj), names, defaults + row))
+        objects.append(obj)
+    return objects
+
+
+def _model_plain_objects(cls, states):
+    objects = []
+    for state in states:
+        obj = cls.__new__(cls)
+        obj.__dict__.update(state)
+        objects.append(obj)
+    return objects
+
+
+def _tokens_model(tokens):
+    rows = _model_rows(tokens, _TOKEN_FIELDS)
+    for row, token in zip(rows, tokens):
+        row.append(_model_rows([token.valueType], _VALUETYPE_FIELDS)[0] if token.valueType else None)
+    return rows
+
+
+def _load_tokens_model(rows):
+    tokens = _model_objects(Token, _TOKEN_FIELDS, rows)
+    for token, row in zip(tokens, rows):
+        if row[-1] is not None:
+            token.valueType = _model_objects(ValueType, _VALUETYPE_FIELDS, [row[-1]])[0]
+    return tokens
+
+
+def _configuration_model(cfg):
+    return {
+        'name': cfg.name,
+        'ids': [Id for Id, value in cfg.ids.items() if value],
+        'directives': [vars(directive) for directive in cfg.directives],
+        'macro_usage': [vars(macro) for macro in cfg.macro_usage],
+        'preprocessor_if_conditions': [vars(cond) for cond in cfg.preprocessor_if_conditions],
+        'tokenlist': _tokens_model(cfg.tokenlist),
+        'scopes': _model_rows(cfg.scopes, _SCOPE_FIELDS),
+        'functions': [row + [function.nestedIn.Id] for row, function in
+                      zip(_model_rows(cfg.functions, _FUNCTION_FIELDS), cfg.functions)],
+        'variables': _model_rows(cfg.variables, _VARIABLE_FIELDS),
+        'arguments': _model_rows(cfg.arguments, _VARIABLE_FIELDS),
+        'typedefInfo': [vars(info) for info in cfg.typedefInfo],
+        'valueflow': [[values.Id, _model_rows(values.values, _VALUE_FIELDS)]
+                      for values in cfg.valueflow],
+        'standards': vars(cfg.standards),
+        'clang_warnings': cfg.clang_warnings,
+    }
+
+
+def _load_configuration_model(model, drop_ids):
+    cfg = Configuration(model['name'])
+    for value, Id in enumerate(model['ids'], 1):
+        cfg.ids[Id] = value
+    cfg.ids.size = len(model['ids']) + 1
+    cfg.directives = _model_plain_objects(Directive, model['directives'])
+    cfg.macro_usage = _model_plain_objects(MacroUsage, model['macro_usage'])
+    cfg.preprocessor_if_conditions = _model_plain_objects(PreprocessorIfCondition,
+                                                          model['preprocessor_if_conditions'])
+    cfg.tokenlist = _load_tokens_model(model['tokenlist'])
+    cfg.scopes = _model_objects(Scope, _SCOPE_FIELDS, model['scopes'])
+    for scope in cfg.scopes:
+        scope.varlist = []
+    scopes = {scope.Id: scope for scope in cfg.scopes}
+    cfg.functions = _model_objects(Function, _FUNCTION_FIELDS, model['functions'])
+    for function, row in zip(cfg.functions, model['functions']):
+        function.argument = {}
+        function.nestedIn = scopes[row[-1]]
+    cfg.variables = _model_objects(Variable, _VARIABLE_FIELDS, model['variables'])
+    arguments = _model_objects(Variable, _VARIABLE_FIELDS, model['arguments'])
+    cfg.typedefInfo = _model_plain_objects(TypedefInfo, model['typedefInfo'])
+    for Id, rows in model['valueflow']:
+        values = ValueFlow({})
+        values.Id = Id
+        values.values = _model_objects(Value, _VALUE_FIELDS, rows)
+        cfg.valueflow.append(values)
+    cfg.standards.__dict__.update(model['standards'])
+    cfg.clang_warnings = model['clang_warnings']
+    cfg.setIdMap(arguments, drop_ids)
+    return cfg
+
+
+def _dump_digest(filename):
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _model_cache_filename(cache_dir, digest):
+    return os.path.join(cache_dir, digest.hex() + '.bin')
+
+
+def write_model_cache(filename, cache_dir):
+    """
+    Parse a cppcheck dump file and store the loaded model in cache_dir. The
+    cache file is named after the sha256 of the dump. Returns the CppcheckData.
+    """
+    size = os.stat(filename).st_size
+    digest = _dump_digest(filename)
+    data = CppcheckData(filename)
+    model = {
+        'platform': vars(data.platform) if data.platform else None,
+        'files': data.files,
+        'rawTokens': _tokens_model(data.rawTokens),
+        'suppressions': [vars(suppression) for suppression in data.suppressions],
+        'configurations': [_configuration_model(cfg) for cfg in data.configurations],
+    }
+    header = MODEL_CACHE_HEADER.pack(MODEL_CACHE_MAGIC, MODEL_CACHE_VERSION, size, digest)
+    cache_filename = _model_cache_filename(cache_dir, digest)
+    tmp_filename = '%s.%d.tmp' % (cache_filename, os.getpid())
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_filename, 'wb') as f:
+            f.write(header)
+            marshal.dump(model, f)
+        os.replace(tmp_filename, cache_filename)
+    except OSError:
+        # the cache is optional, e.g. the cache directory is read-only
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+    return data
+
+
+def load_model_cache(filename, cache_dir, drop_ids=False):
+    """
+    Load the model of a cppcheck dump file from cache_dir. Returns None when
+    the dump is not cached or the cache file is not valid.
+    """
+    try:
+        size = os.stat(filename).st_size
+        digest = _dump_digest(filename)
+        f = open(_model_cache_filename(cache_dir, digest), 'rb')
+    except OSError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size <= MODEL_CACHE_HEADER.size:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            magic, version, cached_size, cached_digest = MODEL_CACHE_HEADER.unpack_from(m)
+            if (magic, version, cached_size, cached_digest) != (MODEL_CACHE_MAGIC, MODEL_CACHE_VERSION,
+                                                                size, digest):
+                return None
+            try:
+                with memoryview(m) as view, view[MODEL_CACHE_HEADER.size:] as payload:
+                    model = marshal.loads(payload)
+            except (ValueError, EOFError, TypeError):
+                return None
+
+    data = CppcheckData.__new__(CppcheckData)
+    data.sections = set(SECTIONS)
+    data._skip_tags = set()
+    data.filename = filename
+    data.backend = None
+    data.drop_ids = drop_ids
+    data.cfg_filter = None
+    data.load_valueflow = True
+    data._events = None
+    data._first_dump = None
+    data._header_node = None
+    try:
+        data.platform = Platform.__new__(Platform) if model['platform'] else None
+        if data.platform:
+            data.platform.__dict__.update(model['platform'])
+        data.files = model['files']
+        data.rawTokens = _load_tokens_model(model['rawTokens'])
+        data.suppressions = _model_plain_objects(Suppression, model['suppressions'])
+        data._configurations = [_load_configuration_model(cfg, drop_ids)
+                                for cfg in model['configurations']]
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError):
+        # not a cache file written by write_model_cache()
+        return None
+    data._set_raw_tokens_links()
+
+    global current_dumpfile_suppressions
+    current_dumpfile_suppressions = data.suppressions
+    return data
+
+
+def parsedump(filename, cache_dir=None):
     """
     parse a cppcheck dump file
+
+    :param cache_dir: Directory of the model cache, see write_model_cache()
     """
+    if cache_dir is not None:
+        data = load_model_cache(filename, cache_dir)
+        if data is None:
+            data = write_model_cache(filename, cache_dir)
+        return data
     return CppcheckData(filename)
 
 
@@ -1476,11 +2129,14 @@ def get_function_call_name_args(token):
             nametok = nametok.previous.previous
     return name, getArguments(token)
 
+_suppression_index = None
+
 def is_suppressed(location, message, errorId):
-    for suppression in current_dumpfile_suppressions:
-        if suppression.isMatch(location.file, location.linenr, message, errorId):
-            return True
-    return False
+    global _suppression_index
+    # The index is rebuilt when a dump file is loaded or a suppression is added
+    if _suppression_index is None or not _suppression_index.isUpToDate(current_dumpfile_suppressions):
+        _suppression_index = SuppressionIndex(current_dumpfile_suppressions)
+    return _suppression_index.isMatch(location.file, location.linenr, message, errorId)
 
 def reportError(location, severity, message, addon, errorId, extra=''):
     if '--cli' in sys.argv:
@@ -26,6 +26,7 @@ import argparse
 import codecs
 import string
 import copy
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     from itertools import izip as zip
@@ -1241,10 +1242,57 @@ class Rule(object):
         return "%d.%d (%s)" % (self.num1, self.num2, self.misra_severity)
 
 
+class RuleSuppressions(object):
+    """Suppressions of one rule in one file (or in all files)"""
+
+    __slots__ = ["items", "entire_file", "lines", "symbols"]
+
+    def __init__(self):
+        # (lineNumber, symbolName) tuples, or None for the entire file, in the
+        # order they were added. Used as an ordered set.
+        self.items = dict()
+        self.entire_file = False
+        self.lines = set()
+        # compiled symbol name patterns
+        self.symbols = []
+
+    def add(self, line_symbol):
+        """
+        Add a suppression. Raises re.error if the symbol name is not a
+        valid regular expression, the suppression is not added then.
+        """
+        if line_symbol in self.items:
+            return
+        if line_symbol is None:
+            self.entire_file = True
+        else:
+            lineNumber, symbolName = line_symbol
+            if lineNumber is not None:
+                # A line suppression applies to the whole line, whatever
+                # symbol name it was given with
+                self.lines.add(lineNumber)
+            else:
+                self.symbols.append(re.compile(symbolName))
+        self.items[line_symbol] = None
+
+    def isMatch(self, linenr, symbolName=None):
+        if self.entire_file or linenr in self.lines:
+            return True
+        if symbolName is None:
+            return False
+        for symbol in self.symbols:
+            if symbol.fullmatch(symbolName):
+                return True
+        return False
+
+    def __repr__(self):
+        return "RuleSuppressions(%s)" % repr(list(self.items))
+
+
 class MisraSettings(object):
     """Hold settings for misra.py script."""
 
-    __slots__ = ["verify", "quiet", "show_summary"]
+    __slots__ = ["verify", "quiet", "show_summary", "jobs", "dump_cache"]
 
     def __init__(self, args):
         """
@@ -1253,6 +1301,8 @@ class MisraSettings(object):
         self.verify = False
         self.quiet = False
         self.show_summary = True
+        self.jobs = 1
+        self.dump_cache = None
 
         if args.verify:
             self.verify = True
@@ -1263,15 +1313,31 @@ class MisraSettings(object):
             self.quiet = True
         if args.no_summary:
             self.show_summary = False
+        if args.jobs > 1:
+            self.jobs = args.jobs
+        if args.dump_cache:
+            self.dump_cache = args.dump_cache
 
     def __repr__(self):
-        attrs = ["verify", "quiet", "show_summary", "verify"]
+        attrs = ["verify", "quiet", "show_summary", "verify", "jobs", "dump_cache"]
         return "{}({})".format(
             "MisraSettings",
             ", ".join(("{}={}".format(a, repr(getattr(self, a))) for a in attrs))
         )
 
 
+# Flag of the MisraChecker that guards each CTU summary type, the other
+# summaries are saved for every configuration
+CTU_SUMMARY_FLAGS = {
+    'MisraTypedefInfo': '_ctu_summary_typedefs',
+    'MisraTagName': '_ctu_summary_tagnames',
+    'MisraExternalIdentifiers': '_ctu_summary_identifiers',
+    'MisraInternalIdentifiers': '_ctu_summary_identifiers',
+    'MisraLocalIdentifiers': '_ctu_summary_identifiers',
+    'MisraUsage': '_ctu_summary_usage',
+}
+
+
 class MisraChecker:
 
     def __init__(self, settings, stdversion="c89"):
@@ -1299,10 +1365,10 @@ class MisraChecker:
         # Dict1 is keyed by rule number in the hundreds format of
         # Major *  100 + minor. ie Rule 5.2 = (5*100) + 2
         # Dict 2 is keyed by filename.  An entry of None means suppress globally.
-        # Each file name entry contains a list of tuples of (lineNumber, symbolName)
-        # or an item of None which indicates suppress rule for the entire file.
-        # The line and symbol name tuple may have None as either of its elements but
-        # should not be None for both.
+        # Each file name entry is a RuleSuppressions holding the suppressed
+        # (lineNumber, symbolName) tuples or None which indicates suppress rule
+        # for the entire file. The line and symbol name tuple may have None as
+        # either of its elements but should not be None for both.
         self.suppressedRules = dict()
 
         # Prefix to ignore when matching suppression files.
@@ -1324,6 +1390,16 @@ class MisraChecker:
 
         self.path_premium_addon = None
 
+        # Rule texts of the premium addon keyed by errorId, None when the
+        # addon has no text for the rule
+        self.premiumRuleTexts = dict()
+        self.premiumRuleTexts_filename = None
+        self.premiumRuleTexts_changed = False
+
+        # When not None, reported errors, status lines and CTU summaries are
+        # recorded here instead of being reported (see parse_dump_deferred)
+        self.events = None
+
     def __repr__(self):
         attrs = ["settings", "verify_expected", "verify_actual", "violations",
                  "ruleTexts", "suppressedRules", "filePrefix",
@@ -1349,7 +1425,7 @@ class MisraChecker:
         for ti in typedef_info:
             summary.append({ 'name': ti.name, 'file': ti.file, 'line': ti.linenr, 'column': ti.column, 'used': ti.used })
         if len(summary) > 0:
-            cppcheckdata.reportSummary(dumpfile, 'MisraTypedefInfo', summary)
+            self.reportSummary(dumpfile, 'MisraTypedefInfo', summary)
 
     def _save_ctu_summary_tagnames(self, dumpfile, cfg):
         if self._ctu_summary_tagnames:
@@ -1373,7 +1449,7 @@ class MisraChecker:
                 tok = tok.next
             summary.append({'name': scope.className, 'used':used, 'file': scope.bodyStart.file, 'line': scope.bodyStart.linenr, 'column': scope.bodyStart.column})
         if len(summary) > 0:
-            cppcheckdata.reportSummary(dumpfile, 'MisraTagName', summary)
+            self.reportSummary(dumpfile, 'MisraTagName', summary)
 
     def _save_ctu_summary_identifiers(self, dumpfile, cfg):
         if self._ctu_summary_identifiers:
@@ -1423,9 +1499,9 @@ class MisraChecker:
                 i['decl'] = func.token is None
                 external_identifiers.append(i)
 
-        cppcheckdata.reportSummary(dumpfile, 'MisraExternalIdentifiers', external_identifiers)
-        cppcheckdata.reportSummary(dumpfile, 'MisraInternalIdentifiers', internal_identifiers)
-        cppcheckdata.reportSummary(dumpfile, 'MisraLocalIdentifiers', local_identifiers)
+        self.reportSummary(dumpfile, 'MisraExternalIdentifiers', external_identifiers)
+        self.reportSummary(dumpfile, 'MisraInternalIdentifiers', internal_identifiers)
+        self.reportSummary(dumpfile, 'MisraLocalIdentifiers', local_identifiers)
 
     def _save_ctu_summary_usage(self, dumpfile, cfg):
         if self._ctu_summary_usage:
@@ -1446,7 +1522,7 @@ class MisraChecker:
                     names.append({'name': token.str, 'file': token.file})
 
         if len(names) > 0:
-            cppcheckdata.reportSummary(dumpfile, 'MisraUsage', names)
+            self.reportSummary(dumpfile, 'MisraUsage', names)
 
 
     def misra_1_4(self, cfg):
@@ -1503,7 +1579,7 @@ class MisraChecker:
                 macro_name = res.group(1)
                 summary.append({'name': macro_name, 'used': (macro_name in used_macros), 'file': directive.file, 'line': directive.linenr, 'column': directive.column})
         if len(summary) > 0:
-            cppcheckdata.reportSummary(dumpfile, 'MisraMacro', summary)
+            self.reportSummary(dumpfile, 'MisraMacro', summary)
 
     def misra_2_7(self, data):
         for func in data.functions:
@@ -3856,17 +3932,16 @@ class MisraChecker:
         Add a suppression to the suppressions data structure
 
         Suppressions are stored in a dictionary of dictionaries that
-        contains a list of tuples.
+        contains RuleSuppressions.
 
         The first dictionary is keyed by the MISRA rule in hundreds
         format. The value of that dictionary is a dictionary of filenames.
         If the value is None then the rule is assumed to be suppressed for
         all files.
-        If the filename exists then the value of that dictionary contains a list
-        with the scope of the suppression.  If the list contains an item of None
-        then the rule is assumed to be suppressed for the entire file. Otherwise
-        the list contains line number, symbol name tuples.
-        For each tuple either line number or symbol name can can be none.
+        If the filename exists then the value of that dictionary holds
+        the scope of the suppression: the entire file, a set of line numbers
+        and a list of symbol names. For each (line number, symbol name)
+        either line number or symbol name can be None.
 
         """
         normalized_filename = None
@@ -3880,79 +3955,40 @@ class MisraChecker:
         else:
             line_symbol = None
 
-        # If the rule is not in the dict already then add it
-        if ruleNum not in self.suppressedRules:
-            ruleItemList = list()
-            ruleItemList.append(line_symbol)
-
-            fileDict = dict()
-            fileDict[normalized_filename] = ruleItemList
-
-            self.suppressedRules[ruleNum] = fileDict
-
-            # Rule is added.  Done.
-            return
-
-        # Rule existed in the dictionary. Check for
-        # filename entries.
-
-        # Get the dictionary for the rule number
-        fileDict = self.suppressedRules[ruleNum]
-
-        # If the filename is not in the dict already add it
-        if normalized_filename not in fileDict:
-            ruleItemList = list()
-            ruleItemList.append(line_symbol)
-
-            fileDict[normalized_filename] = ruleItemList
-
-            # Rule is added with a file scope. Done
+        suppressions = self.suppressedRules.get(ruleNum, dict()).get(normalized_filename, RuleSuppressions())
+        try:
+            suppressions.add(line_symbol)
+        except re.error as err:
+            print('Ignoring suppression of rule %d.%d: invalid symbol name "%s" (%s)' % (
+                ruleNum // 100, ruleNum % 100, symbolName, err))
             return
+        self.suppressedRules.setdefault(ruleNum, dict())[normalized_filename] = suppressions
 
-        # Rule has a matching filename. Get the rule item list.
-
-        # Check the lists of rule items
-        # to see if this (lineNumber, symbolName) combination
-        # or None already exists.
-        ruleItemList = fileDict[normalized_filename]
-
-        if line_symbol is None:
-            # is it already in the list?
-            if line_symbol not in ruleItemList:
-                ruleItemList.append(line_symbol)
-        else:
-            # Check the list looking for matches
-            matched = False
-            for each in ruleItemList:
-                if each is not None:
-                    if (each[0] == line_symbol[0]) and (each[1] == line_symbol[1]):
-                        matched = True
-
-            # Append the rule item if it was not already found
-            if not matched:
-                ruleItemList.append(line_symbol)
-
-    def isRuleSuppressed(self, file_path, linenr, ruleNum):
+    def isRuleSuppressed(self, file_path, linenr, ruleNum, symbolName=None):
         """
         Check to see if a rule is suppressed.
 
         :param ruleNum: is the rule number in hundreds format
         :param file_path: File path of checked location
         :param linenr: Line number of checked location
+        :param symbolName: Name of the symbol at the checked location, if any
 
         If the rule exists in the dict then check for a filename
         If the filename is None then rule is suppressed globally
         for all files.
-        If the filename exists then look for list of
-        line number, symbol name tuples.  If the list is None then
-        the rule is suppressed for the entire file
-        If the list of tuples exists then search the list looking for
-        matching line numbers.  Symbol names are currently ignored
-        because they can include regular expressions.
-        TODO: Support symbol names and expression matching.
+        If the filename exists then the rule is suppressed if it is
+        suppressed for the entire file, for the line number, or for
+        a symbol name (a regular expression) matching symbolName.
 
         """
-        ruleIsSuppressed = False
+        fileDict = self.suppressedRules.get(ruleNum)
+        if fileDict is None:
+            return False
+
+        # a file name entry of None means that the rule is suppressed
+        # globally
+        if None in fileDict:
+            return True
 
         # Remove any prefix listed in command arguments from the filename.
         filename = None
@@ -3962,34 +3998,10 @@ class MisraChecker:
             else:
                 filename = os.path.basename(file_path)
 
-        if ruleNum in self.suppressedRules:
-            fileDict = self.suppressedRules[ruleNum]
-
-            # a file name entry of None means that the rule is suppressed
-            # globally
-            if None in fileDict:
-                ruleIsSuppressed = True
-            else:
-                # Does the filename match one of the names in
-                # the file list
-                if filename in fileDict:
-                    # Get the list of ruleItems
-                    ruleItemList = fileDict[filename]
-
-                    if None in ruleItemList:
-                        # Entry of None in the ruleItemList means the rule is
-                        # suppressed for all lines in the filename
-                        ruleIsSuppressed = True
-                    else:
-                        # Iterate though the the list of line numbers
-                        # and symbols looking for a match of the line
-                        # number.  Matching the symbol is a TODO:
-                        for each in ruleItemList:
-                            if each is not None:
-                                if each[0] == linenr:
-                                    ruleIsSuppressed = True
-
-        return ruleIsSuppressed
+        suppressions = fileDict.get(filename)
+        if suppressions is None:
+            return False
+        return suppressions.isMatch(linenr, symbolName)
 
     def isRuleGloballySuppressed(self, rule_num):
         """
@@ -4011,7 +4023,7 @@ class MisraChecker:
             fileDict = self.suppressedRules[ruleNum]
 
             for fname in fileDict:
-                ruleItemList = fileDict[fname]
+                ruleItemList = fileDict[fname].items
 
                 for item in ruleItemList:
                     if item is None:
@@ -4054,7 +4066,14 @@ class MisraChecker:
 
                 self.addSuppressedRule(ruleNum)
 
-    def reportError(self, location, num1, num2):
+    def reportError(self, location, num1, num2, symbolName=None):
+        if symbolName is None and getattr(location, 'isName', False):
+            symbolName = location.str
+
+        if self.events is not None:
+            self.events.append(('error', location.file, location.linenr, location.column, num1, num2, symbolName))
+            return
+
         ruleNum = num1 * 100 + num2
 
         if self.isRuleGloballySuppressed(ruleNum):
@@ -4062,7 +4081,7 @@ class MisraChecker:
 
         if self.settings.verify:
             self.verify_actual.append('%s:%d %d.%d' % (location.file, location.linenr, num1, num2))
-        elif self.isRuleSuppressed(location.file, location.linenr, ruleNum):
+        elif self.isRuleSuppressed(location.file, location.linenr, ruleNum, symbolName):
             # Error is suppressed. Ignore
             self.suppressionStats.setdefault(ruleNum, 0)
             self.suppressionStats[ruleNum] += 1
@@ -4082,10 +4101,9 @@ class MisraChecker:
                 else:
                     errmsg = 'misra violation (rule-texts-file not found: ' + self.ruleText_filename + ')'
                 if self.path_premium_addon:
-                    for line in cppcheckdata.cmd_output([self.path_premium_addon, '--cli', '--get-rule-text=' + errorId]).split('\n'):
-                        if len(line) > 1 and not line.startswith('{'):
-                            errmsg = line.strip()
-                            break
+                    rule_text = self.getPremiumRuleText(errorId)
+                    if rule_text is not None:
+                        errmsg = rule_text
             else:
                 errmsg = 'misra violation %s with no text in the supplied rule-texts-file' % (ruleNum)
 
@@ -4104,6 +4122,58 @@ class MisraChecker:
                     self.violations[misra_severity] = []
                 self.violations[misra_severity].append('misra-' + errorId)
 
+    def getPremiumRuleText(self, errorId):
+        """
+        Get the rule text of errorId from the premium addon. The addon is
+        only executed once for each errorId.
+        """
+        if errorId in self.premiumRuleTexts:
+            return self.premiumRuleTexts[errorId]
+        rule_text = None
+        for line in cppcheckdata.cmd_output([self.path_premium_addon, '--cli', '--get-rule-text=' + errorId]).split('\n'):
+            if len(line) > 1 and not line.startswith('{'):
+                rule_text = line.strip()
+                break
+        self.premiumRuleTexts[errorId] = rule_text
+        self.premiumRuleTexts_changed = True
+        return rule_text
+
+    def _premiumAddonStamp(self):
+        stat = os.stat(self.path_premium_addon)
+        return [self.path_premium_addon, stat.st_size, stat.st_mtime_ns]
+
+    def loadPremiumRuleTexts(self, filename):
+        """
+        Load the premium addon rule texts cached by savePremiumRuleTexts().
+        The cache is ignored if it was written for another premium addon binary.
+        """
+        self.premiumRuleTexts_filename = filename
+        if not self.path_premium_addon:
+            return
+        try:
+            with open(filename, 'rt') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(cache, dict) and cache.get('premiumaddon') == self._premiumAddonStamp():
+            self.premiumRuleTexts.update(cache.get('texts', {}))
+
+    def savePremiumRuleTexts(self):
+        """Store the premium addon rule texts if new ones were fetched."""
+        if not self.premiumRuleTexts_filename or not self.premiumRuleTexts_changed:
+            return
+        cache = {'premiumaddon': self._premiumAddonStamp(), 'texts': self.premiumRuleTexts}
+        tmp_filename = '%s.%d.tmp' % (self.premiumRuleTexts_filename, os.getpid())
+        try:
+            with open(tmp_filename, 'wt') as f:
+                json.dump(cache, f, indent=1, sort_keys=True)
+            os.replace(tmp_filename, self.premiumRuleTexts_filename)
+        except OSError:
+            # the cache is optional
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+        self.premiumRuleTexts_changed = False
+
     def loadRuleTexts(self, filename):
         num1 = 0
         num2 = 0
@@ -4218,7 +4288,39 @@ class MisraChecker:
         else:
             print("Missing rule texts: " + ', '.join(missing_rules))
 
+    def reportSummary(self, dumpfile, summary_type, summary_data):
+        if self.events is not None:
+            self.events.append(('summary', dumpfile, summary_type, summary_data))
+        else:
+            cppcheckdata.reportSummary(dumpfile, summary_type, summary_data)
+
+    def replayEvents(self, events, suppressions, ctu_summaries):
+        """Report the events recorded by parse_dump_deferred() for one dump file.
+
+        Errors go through reportError() so that suppressions, duplicates and
+        the violation counts are handled exactly like in a serial run. A CTU
+        summary guarded by a flag is only written if it has not been saved for
+        an earlier dump.
+        """
+        cppcheckdata.current_dumpfile_suppressions = suppressions
+        saved = set(flag for flag in ctu_summaries if not getattr(self, flag))
+        for event in events:
+            if event[0] == 'status':
+                self.printStatus(*event[1], **event[2])
+            elif event[0] == 'error':
+                location = cppcheckdata.Location({'file': event[1], 'linenr': event[2], 'column': event[3]})
+                self.reportError(location, event[4], event[5], event[6])
+            else:
+                flag = CTU_SUMMARY_FLAGS.get(event[2])
+                if flag is None or flag in saved:
+                    cppcheckdata.reportSummary(*event[1:])
+        for flag in ctu_summaries:
+            setattr(self, flag, True)
+
     def printStatus(self, *args, **kwargs):
+        if self.events is not None:
+            self.events.append(('status', args, kwargs))
+            return
         if not self.settings.quiet:
             print(*args, **kwargs)
 
@@ -4254,7 +4356,7 @@ class MisraChecker:
                     if rule_re.match(word):
                         verify_expected.append('%s:%d %s' % (tok.file, tok.linenr, word))
 
-        data = cppcheckdata.parsedump(dumpfile)
+        data = cppcheckdata.parsedump(dumpfile, cache_dir=self.settings.dump_cache)
 
         typeBits['CHAR'] = data.platform.char_bit
         typeBits['SHORT'] = data.platform.short_bit
@@ -4435,9 +4537,10 @@ class MisraChecker:
             self.executeCheck(2210, self.misra_22_10, cfg)
 
     def analyse_ctu_info(self, ctu_info_files):
-        all_typedef_info = []
-        all_tagname_info = []
-        all_macro_info = []
+        # keyed by name, the first summary of each name is kept
+        all_typedef_info = {}
+        all_tagname_info = {}
+        all_macro_info = {}
         all_external_identifiers_decl = {}
         all_external_identifiers_def = {}
         all_internal_identifiers = {}
@@ -4451,104 +4554,89 @@ class MisraChecker:
 
         try:
             for filename in ctu_info_files:
-                for line in open(filename, 'rt'):
-                    if not line.startswith('{'):
-                        continue
+                with open(filename, 'rt') as f:
+                    for line in f:
+                        if not line.startswith('{'):
+                            continue
 
-                    s = json.loads(line)
-                    summary_type = s['summary']
-                    summary_data = s['data']
-
-                    if summary_type == 'MisraTypedefInfo':
-                        for new_typedef_info in summary_data:
-                            found = False
-                            for old_typedef_info in all_typedef_info:
-                                if old_typedef_info['name'] == new_typedef_info['name']:
-                                    found = True
-                                    if is_different_location(old_typedef_info, new_typedef_info):
-                                        self.reportError(Location(old_typedef_info), 5, 6)
-                                        self.reportError(Location(new_typedef_info), 5, 6)
-                                    else:
-                                        if new_typedef_info['used']:
-                                            old_typedef_info['used'] = True
-                                    break
-                            if not found:
-                                all_typedef_info.append(new_typedef_info)
-
-                    if summary_type == 'MisraTagName':
-                        for new_tagname_info in summary_data:
-                            found = False
-                            for old_tagname_info in all_tagname_info:
-                                if old_tagname_info['name'] == new_tagname_info['name']:
-                                    found = True
-                                    if is_different_location(old_tagname_info, new_tagname_info):
-                                        self.reportError(Location(old_tagname_info), 5, 7)
-                                        self.reportError(Location(new_tagname_info), 5, 7)
-                                    else:
-                                        if new_tagname_info['used']:
-                                            old_tagname_info['used'] = True
-                                    break
-                            if not found:
-                                all_tagname_info.append(new_tagname_info)
-
-                    if summary_type == 'MisraMacro':
-                        for new_macro in summary_data:
-                            found = False
-                            for old_macro in all_macro_info:
-                                if old_macro['name'] == new_macro['name']:
-                                    found = True
-                                    if new_macro['used']:
-                                        old_macro['used'] = True
-                                    break
-                            if not found:
-                                all_macro_info.append(new_macro)
-
-                    if summary_type == 'MisraExternalIdentifiers':
-                        for s in summary_data:
-                            is_declaration = s['decl']
-                            if is_declaration:
-                                all_external_identifiers = all_external_identifiers_decl
-                            else:
-                                all_external_identifiers = all_external_identifiers_def
-
-                            name = s['name']
-                            if name in all_external_identifiers and is_different_location(s, all_external_identifiers[name]):
-                                num = 5 if is_declaration else 6
-                                self.reportError(Location(s), 8, num)
-                                self.reportError(Location(all_external_identifiers[name]), 8, num)
-                            all_external_identifiers[name] = s
-
-                    if summary_type == 'MisraInternalIdentifiers':
-                        for s in summary_data:
-                            if s['name'] in all_internal_identifiers:
-                                if not s['inlinefunc'] or s['file'] != all_internal_identifiers[s['name']]['file']:
-                                    self.reportError(Location(s), 5, 9)
-                                    self.reportError(Location(all_internal_identifiers[s['name']]), 5, 9)
-                            all_internal_identifiers[s['name']] = s
-
-                    if summary_type == 'MisraLocalIdentifiers':
-                        for s in summary_data:
-                            all_local_identifiers[s['name']] = s
-
-                    if summary_type == 'MisraUsage':
-                        for s in summary_data:
-                            if s['name'] in all_usage_files:
-                                all_usage_files[s['name']].append(s['file'])
-                            else:
-                                all_usage_files[s['name']] = [s['file']]
+                        s = json.loads(line)
+                        summary_type = s['summary']
+                        summary_data = s['data']
+
+                        if summary_type == 'MisraTypedefInfo':
+                            for new_typedef_info in summary_data:
+                                old_typedef_info = all_typedef_info.setdefault(new_typedef_info['name'], new_typedef_info)
+                                if old_typedef_info is new_typedef_info:
+                                    continue
+                                if is_different_location(old_typedef_info, new_typedef_info):
+                                    self.reportError(Location(old_typedef_info), 5, 6)
+                                    self.reportError(Location(new_typedef_info), 5, 6)
+                                elif new_typedef_info['used']:
+                                    old_typedef_info['used'] = True
+
+                        if summary_type == 'MisraTagName':
+                            for new_tagname_info in summary_data:
+                                old_tagname_info = all_tagname_info.setdefault(new_tagname_info['name'], new_tagname_info)
+                                if old_tagname_info is new_tagname_info:
+                                    continue
+                                if is_different_location(old_tagname_info, new_tagname_info):
+                                    self.reportError(Location(old_tagname_info), 5, 7)
+                                    self.reportError(Location(new_tagname_info), 5, 7)
+                                elif new_tagname_info['used']:
+                                    old_tagname_info['used'] = True
+
+                        if summary_type == 'MisraMacro':
+                            for new_macro in summary_data:
+                                old_macro = all_macro_info.setdefault(new_macro['name'], new_macro)
+                                if new_macro['used']:
+                                    old_macro['used'] = True
+
+                        if summary_type == 'MisraExternalIdentifiers':
+                            for s in summary_data:
+                                is_declaration = s['decl']
+                                if is_declaration:
+                                    all_external_identifiers = all_external_identifiers_decl
+                                else:
+                                    all_external_identifiers = all_external_identifiers_def
+
+                                name = s['name']
+                                if name in all_external_identifiers and is_different_location(s, all_external_identifiers[name]):
+                                    num = 5 if is_declaration else 6
+                                    self.reportError(Location(s), 8, num)
+                                    self.reportError(Location(all_external_identifiers[name]), 8, num)
+                                all_external_identifiers[name] = s
+
+                        if summary_type == 'MisraInternalIdentifiers':
+                            for s in summary_data:
+                                if s['name'] in all_internal_identifiers:
+                                    if not s['inlinefunc'] or s['file'] != all_internal_identifiers[s['name']]['file']:
+                                        self.reportError(Location(s), 5, 9)
+                                        self.reportError(Location(all_internal_identifiers[s['name']]), 5, 9)
+                                all_internal_identifiers[s['name']] = s
+
+                        if summary_type == 'MisraLocalIdentifiers':
+                            for s in summary_data:
+                                all_local_identifiers[s['name']] = s
+
+                        if summary_type == 'MisraUsage':
+                            for s in summary_data:
+                                if s['name'] in all_usage_files:
+                                    all_usage_files[s['name']].append(s['file'])
+                                else:
+                                    all_usage_files[s['name']] = [s['file']]
 
         except FileNotFoundError:
             return
 
-        for ti in all_typedef_info:
+        for ti in all_typedef_info.values():
             if not ti['used']:
                 self.reportError(Location(ti), 2, 3)
 
-        for ti in all_tagname_info:
+        for ti in all_tagname_info.values():
             if not ti['used']:
                 self.reportError(Location(ti), 2, 4)
 
-        for m in all_macro_info:
+        for m in all_macro_info.values():
             if not m['used']:
                 self.reportError(Location(m), 2, 5)
 
@@ -4575,6 +4663,24 @@ class MisraChecker:
             if name in all_external_identifiers:
                 self.reportError(Location(all_external_identifiers[name]), 8, 7)
 
+
+def parse_dump_deferred(checker, dumpfile):
+    """Check one dump file in a worker process.
+
+    Nothing is reported here: the events are returned together with the
+    suppressions of the dump file and the CTU summaries that were saved,
+    and the main process reports them with MisraChecker.replayEvents().
+    The suppressions include the ones cppcheck writes after the
+    configurations, parsedump() reads them before any rule runs.
+    """
+    checker.events = []
+    for flag in sorted(set(CTU_SUMMARY_FLAGS.values())):
+        setattr(checker, flag, False)
+    checker.parseDump(dumpfile)
+    ctu_summaries = [flag for flag in sorted(set(CTU_SUMMARY_FLAGS.values())) if getattr(checker, flag)]
+    return checker.events, cppcheckdata.current_dumpfile_suppressions, ctu_summaries
+
+
 RULE_TEXTS_HELP = '''Path to text file of MISRA rules
 
 If you have the tool 'pdftotext' you might be able
@@ -4625,6 +4731,9 @@ def get_args_parser():
     parser.add_argument("-generate-table", help=argparse.SUPPRESS, action="store_true")
     parser.add_argument("-verify", help=argparse.SUPPRESS, action="store_true")
     parser.add_argument("--severity", type=str, help="Set a custom severity string, for example 'error' or 'warning'. ")
+    parser.add_argument("--rule-text-cache", type=str, help="File where the rule texts of the premium addon are cached between runs")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of dump files checked in parallel")
+    parser.add_argument("--dump-cache", type=str, help="Directory where the parsed dump files are cached, they are reused while the dump file is unchanged")
     return parser
 
 
@@ -4675,32 +4784,43 @@ def main():
     if args.severity:
         checker.setSeverity(args.severity)
 
-    for item in dump_files:
-        checker.parseDump(item)
-
-        if settings.verify:
-            verify_expected = checker.get_verify_expected()
-            verify_actual = checker.get_verify_actual()
-
-            exitCode = 0
-            for expected in verify_expected:
-                if expected not in verify_actual:
-                    print('Expected but not seen: ' + expected)
-                    exitCode = 1
-            for actual in verify_actual:
-                if actual not in verify_expected:
-                    print('Not expected: ' + actual)
-                    exitCode = 1
-
-            # Existing behavior of verify mode is to exit
-            # on the first un-expected output.
-            # TODO: Is this required? or can it be moved to after
-            # all input files have been processed
-            if exitCode != 0:
-                sys.exit(exitCode)
+    if args.rule_text_cache:
+        checker.loadPremiumRuleTexts(os.path.normpath(os.path.expanduser(args.rule_text_cache)))
+
+    if settings.jobs > 1 and len(dump_files) > 1 and not settings.verify:
+        with ProcessPoolExecutor(max_workers=settings.jobs) as executor:
+            # map() yields results in input order, keeping output identical to a serial run
+            for events in executor.map(parse_dump_deferred, itertools.repeat(checker), dump_files):
+                checker.replayEvents(*events)
+    else:
+        for item in dump_files:
+            checker.parseDump(item)
+
+            if settings.verify:
+                verify_expected = checker.get_verify_expected()
+                verify_actual = checker.get_verify_actual()
+
+                exitCode = 0
+                for expected in verify_expected:
+                    if expected not in verify_actual:
+                        print('Expected but not seen: ' + expected)
+                        exitCode = 1
+                for actual in verify_actual:
+                    if actual not in verify_expected:
+                        print('Not expected: ' + actual)
+                        exitCode = 1
+
+                # Existing behavior of verify mode is to exit
+                # on the first un-expected output.
+                # TODO: Is this required? or can it be moved to after
+                # all input files have been processed
+                if exitCode != 0:
+                    sys.exit(exitCode)
 
     checker.analyse_ctu_info(ctu_info_files)
 
+    checker.savePremiumRuleTexts()
+
     if settings.verify:
         sys.exit(exitCode)
 